@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from api import metrics
+from api.settings import (
+    ADMISSION_RETRY_AFTER_SECONDS,
+    BATCH_MAX_CONCURRENCY,
+    BATCH_MAX_QUEUE,
+    IMAGE_MAX_CONCURRENCY,
+    IMAGE_MAX_QUEUE,
+    PDF_MAX_CONCURRENCY,
+    PDF_MAX_QUEUE,
+    RANK_MAX_CONCURRENCY,
+    RANK_MAX_QUEUE,
+)
+
+logger = logging.getLogger("api.admission")
+
+
+# =============================================================================
+# Admission Metrics
+# =============================================================================
+
+ADMISSION_IN_FLIGHT = metrics.registry.gauge(
+    "admission_in_flight",
+    "Requests currently admitted into a pipeline.",
+    ["pipeline"],
+)
+
+ADMISSION_QUEUE_DEPTH = metrics.registry.gauge(
+    "admission_queue_depth",
+    "Requests waiting for a free pipeline slot.",
+    ["pipeline"],
+)
+
+ADMISSION_REJECTIONS = metrics.registry.counter(
+    "admission_rejections_total",
+    "Requests rejected with 503 because the wait queue was full.",
+    ["pipeline"],
+)
+
+
+# =============================================================================
+# Limiter
+# =============================================================================
+
+class AdmissionLimiter:
+    """
+    Bounded concurrency plus a bounded wait queue for one pipeline.
+
+    Up to ``concurrency`` requests run at once and up to ``queue_size`` more
+    wait for a slot; any request beyond that is rejected immediately with
+    503 and a Retry-After header.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, retry_after: int = ADMISSION_RETRY_AFTER_SECONDS):
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.queue_size = max(queue_size, 0)
+        self.retry_after = retry_after
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+
+        ADMISSION_IN_FLIGHT.set(0, pipeline=name)
+        ADMISSION_QUEUE_DEPTH.set(0, pipeline=name)
+
+    def _reject(self):
+        ADMISSION_REJECTIONS.inc(pipeline=self.name)
+        logger.warning(
+            f"[Admission] Rejecting {self.name} request: "
+            f"{self._in_flight} in flight, {self._waiting} waiting"
+        )
+        raise HTTPException(
+            status_code=503,
+            detail=f"The {self.name} pipeline is at capacity, please retry later",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        # Must wait for a slot but the wait queue is already full
+        if self._semaphore.locked() and self._waiting >= self.queue_size:
+            self._reject()
+
+        self._waiting += 1
+        ADMISSION_QUEUE_DEPTH.set(self._waiting, pipeline=self.name)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+            ADMISSION_QUEUE_DEPTH.set(self._waiting, pipeline=self.name)
+
+        self._in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self._in_flight, pipeline=self.name)
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            ADMISSION_IN_FLIGHT.set(self._in_flight, pipeline=self.name)
+            self._semaphore.release()
+
+
+pdf_limiter = AdmissionLimiter("pdf", PDF_MAX_CONCURRENCY, PDF_MAX_QUEUE)
+image_limiter = AdmissionLimiter("image", IMAGE_MAX_CONCURRENCY, IMAGE_MAX_QUEUE)
+batch_limiter = AdmissionLimiter("batch", BATCH_MAX_CONCURRENCY, BATCH_MAX_QUEUE)
+rank_limiter = AdmissionLimiter("rank", RANK_MAX_CONCURRENCY, RANK_MAX_QUEUE)
@@ -0,0 +1,212 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+from api.settings import (
+    PIPELINE_VERSION,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_DISK_MAX_BYTES,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MEMORY_ENTRIES,
+)
+from api import progress
+from api.types.types import ApiResponse
+from api.workers import process_resume, run_in_worker
+
+logger = logging.getLogger("api.cache")
+
+
+# =============================================================================
+# Two-tier Result Cache (memory LRU + disk)
+# =============================================================================
+
+class ResultCache:
+    """
+    Content-addressed cache of successful pipeline results.
+
+    Keys are sha256(pipeline version, kind, file hash), so the same resume
+    uploaded from the profile and apply flows hits the same entry, and a
+    deploy with a new PIPELINE_VERSION never sees stale results.
+    """
+
+    def __init__(
+        self,
+        directory: str = RESULT_CACHE_DIR,
+        memory_entries: int = RESULT_CACHE_MEMORY_ENTRIES,
+        disk_max_bytes: int = RESULT_CACHE_DISK_MAX_BYTES,
+        version: str = PIPELINE_VERSION,
+    ):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.version = version
+
+        self._memory: "OrderedDict[str, ApiResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, kind: str, file_hash: str, layout: Optional[str] = None) -> str:
+        """
+        ``file_hash`` is the sha256 hex digest of the uploaded file. An explicit
+        PDF ``layout`` backend gets its own entry; the default keeps the plain key.
+        """
+        if layout:
+            kind = f"{kind}/{layout}"
+        return hashlib.sha256(f"{self.version}\0{kind}\0{file_hash}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[ApiResponse]:
+        # 1. Memory tier
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return result.model_copy(deep=True)
+
+        # 2. Disk tier (promote to memory on hit)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = ApiResponse.model_validate_json(f.read())
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[Cache] Dropping unreadable entry {key}: {e}")
+            self._remove(path)
+            return None
+
+        self._remember(key, result)
+        return result.model_copy(deep=True)
+
+    def put(self, key: str, result: ApiResponse):
+        self._remember(key, result.model_copy(deep=True))
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(result.model_dump_json())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"[Cache] Failed to write entry {key}: {e}")
+            self._remove(tmp_path)
+            return
+
+        self._evict_disk()
+
+    def _remember(self, key: str, result: ApiResponse):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.disk_max_bytes:
+            return
+
+        # Oldest access first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.disk_max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+result_cache = ResultCache() if RESULT_CACHE_ENABLED else None
+
+# Uploads of the same file that arrive while it is still processing share one run
+_in_flight: Dict[str, "asyncio.Future[ApiResponse]"] = {}
+
+
+def hash_bytes(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+async def process_with_cache(
+    kind: str,
+    source: Union[bytes, str],
+    file_hash: Optional[str] = None,
+    stream_id: Optional[str] = None,
+    layout: Optional[str] = None,
+) -> ApiResponse:
+    """
+    Return a cached result for this file, or run the pipeline and cache it.
+    ``source`` is the file bytes or a spooled upload path (pass its hash).
+    Only a fresh run reports to ``stream_id``; cache hits and joined runs only end it.
+    ``layout`` overrides the PDF layout backend.
+    """
+    if result_cache is None:
+        return await run_in_worker(process_resume, kind, source, stream_id, layout)
+
+    if file_hash is None:
+        file_hash = hash_bytes(source)
+    key = result_cache.key_for(kind, file_hash, layout)
+
+    cached = await asyncio.to_thread(result_cache.get, key)
+    if cached is not None:
+        logger.info(f"[Cache] Hit for {kind} resume {key[:12]}")
+        progress.end(stream_id)
+        return cached
+
+    if key in _in_flight:
+        logger.info(f"[Cache] Joining in-flight run for {kind} resume {key[:12]}")
+        try:
+            result = await asyncio.shield(_in_flight[key])
+        finally:
+            progress.end(stream_id)
+        return result.model_copy(deep=True)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+
+    try:
+        result = await run_in_worker(process_resume, kind, source, stream_id, layout)
+
+        # Only successful runs are cached; errors may be transient (e.g. upload failures)
+        if result.status == "success" and result.redacted_file_url:
+            await asyncio.to_thread(result_cache.put, key, result)
+
+        future.set_result(result)
+        return result
+
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+    except Exception as e:
+        future.set_exception(e)
+        # Nobody may be waiting on the shared future; don't log "never retrieved"
+        future.exception()
+        raise
+
+    finally:
+        _in_flight.pop(key, None)
@@ -2,6 +2,8 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipe
 import os
 import logging
 
+from api.metrics import count_model_call
+
 HF_MODEL_ID = os.environ.get("HF_MODEL_ID")
 
 logger = logging.getLogger("api.image.classifier")
@@ -18,5 +20,6 @@ def load_text_classifier():
     return classifier_pipeline
 
 def classify_text(text, classifier):
+    count_model_call("image_classifier")
     res = classifier(text)[0]
     return res["label"], res["score"]
@@ -8,6 +8,8 @@ from skillNer.general_params import SKILL_DB
 from skillNer.skill_extractor_class import SkillExtractor
 from find_job_titles import Finder
 
+from api.metrics import count_model_call
+
 logger = logging.getLogger("api.image.extraction")
 
 try:
@@ -51,6 +53,7 @@ def extract_skills_skillner(text, score_threshold=0.90):
 
 def extract_conll_entities(text):
     try:
+        count_model_call("conll_ner")
         results = conll_ner(text)
     except Exception:
         return {"PER": [], "ORG": [], "LOC": []}
@@ -3,6 +3,8 @@ import logging
 import cv2
 
 from api.image.builder import build_final_response, convert_image_resume_to_data
+from api import progress
+from api.metrics import stage
 from api.types.types import ApiResponse
 from .preprocessing import (
     mask_segments_on_image, save_temp_image_bytes, mask_to_detected_boxes,
@@ -21,44 +23,67 @@ logger = logging.getLogger("api.image.pipeline")
 def process_image_resume(file_bytes: bytes) -> ApiResponse:
 
     tmp_path = save_temp_image_bytes(file_bytes, ext="jpg")
+
+    try:
+        return process_image_file(tmp_path)
+
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def process_image_file(image_path: str) -> ApiResponse:
+    """Run the pipeline on an image already on disk (e.g. the spooled upload); the file itself is not modified."""
+
+    # Per-request working files, so concurrent resumes never share an image on disk
+    base, _ = os.path.splitext(image_path)
+    upscaled = f"{base}_upscaled.jpg"
+    cleaned = f"{base}_cleaned.jpg"
     redacted_file_url = None
 
     try:
-        tmp_path = upscale_image_for_detection(tmp_path, scale=2.0)
+        with stage("image", "upscale"):
+            upscale_image_for_detection(image_path, scale=2.0, output_path=upscaled)
         
         # 1. YOLO LAYOUT DETECTION
-        detection_result = run_detection(tmp_path)
-        predictions = detections_to_predictions(detection_result)
+        with stage("image", "detection"):
+            detection_result = run_detection(upscaled)
+            predictions = detections_to_predictions(detection_result)
         
         # 2. PREPROCESSING
-        cleaned = adaptive_binarize_for_ocr(tmp_path)
-        cleaned = mask_to_detected_boxes(cleaned, predictions)
-        cleaned = remove_drawing_lines(cleaned)
+        with stage("image", "binarize"):
+            adaptive_binarize_for_ocr(upscaled, cleaned_image_path=cleaned)
+            mask_to_detected_boxes(cleaned, predictions, output_path=cleaned)
+            remove_drawing_lines(cleaned, cleaned_image_path=cleaned)
 
-        for _ in range(3):
-            cleaned = remove_bullets_symbols(cleaned)
+            for _ in range(3):
+                remove_bullets_symbols(cleaned, cleaned_image_path=cleaned)
 
         # 3. OCR PER SEGMENT
-        ocr_segments = crop_and_ocr_boxes(cleaned, predictions)
+        with stage("image", "ocr"):
+            ocr_segments = crop_and_ocr_boxes(cleaned, predictions)
 
         # 4. CLASSIFY + POSTPROCESS OCR TEXT CLEAN
-        classifier = load_text_classifier()
-        classified_segments = []
-
-        for seg in ocr_segments:
-            raw_text = seg.get("text", "").strip()
-            if not raw_text:
-                continue
-            
-            label, score = classify_text(raw_text, classifier)
-            cleaned_text = clean_ocr_text(raw_text)
-
-            classified_segments.append({
-                "segment_id": seg["segment_id"],
-                "label": label,
-                "score": score,
-                "text": cleaned_text
-            })
+        with stage("image", "classify"):
+            classifier = load_text_classifier()
+            classified_segments = []
+
+            for seg in ocr_segments:
+                raw_text = seg.get("text", "").strip()
+                if not raw_text:
+                    continue
+                
+                label, score = classify_text(raw_text, classifier)
+                cleaned_text = clean_ocr_text(raw_text)
+
+                classified_segments.append({
+                    "segment_id": seg["segment_id"],
+                    "label": label,
+                    "score": score,
+                    "text": cleaned_text
+                })
             
         # debug logging
         for cs in classified_segments:
@@ -68,20 +93,25 @@ def process_image_resume(file_bytes: bytes) -> ApiResponse:
         logger.info(predictions)
 
         # 5. MASK PI SEGMENTS
-        cleaned = mask_segments_on_image(cleaned, predictions, classified_segments)
+        with stage("image", "redaction"):
+            mask_segments_on_image(cleaned, predictions, classified_segments)
 
         # 6. SEGMENT NER
-        clean_segments = []
-        for seg in classified_segments:
-            r = run_segment_ner(seg)
-            clean_segments.append(r)
+        with stage("image", "ner"):
+            clean_segments = []
+            for seg in classified_segments:
+                r = run_segment_ner(seg)
+                clean_segments.append(r)
 
         # 7. NORMALIZE OUTPUT (YOUR LOGIC)
-        normalized = normalize_output(clean_segments)
-
         # 8. CONVERT TO ResumeData MODEL
-        resume_dict = build_final_response(normalized)
-        resume_data = convert_image_resume_to_data(resume_dict)
+        with stage("image", "build"):
+            normalized = normalize_output(clean_segments)
+            resume_dict = build_final_response(normalized)
+            resume_data = convert_image_resume_to_data(resume_dict)
+
+        # The UI can render the extracted fields while the redacted copy uploads
+        progress.emit("resume", resume_data)
         
         logging.info(f"[Pipeline] Normalized: {normalized}")
 
@@ -97,7 +127,8 @@ def process_image_resume(file_bytes: bytes) -> ApiResponse:
         # 10. UPLOAD REDACTED FILE
         from api.supabase_client import upload_redacted_resume_to_storage
 
-        upload_result = upload_redacted_resume_to_storage(file_bytes=cleaned_bytes, file_type="jpg")
+        with stage("image", "upload"):
+            upload_result = upload_redacted_resume_to_storage(file_bytes=cleaned_bytes, file_type="jpg")
 
         if upload_result.get("status") == "success":
             redacted_file_url = upload_result.get("signed_url")
@@ -113,14 +144,12 @@ def process_image_resume(file_bytes: bytes) -> ApiResponse:
         )
 
     except Exception as e:
-        os.remove(tmp_path)
-        os.remove(cleaned)
         logger.error(f"[IMAGE] Pipeline error: {e}")
         return ApiResponse(status="error", data=None, message=str(e))
 
     finally:
-        try:
-            os.remove(tmp_path)
-            os.remove(cleaned)
-        except:
-            pass
+        for path in (upscaled, cleaned):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -25,7 +25,7 @@ def save_temp_image_bytes(file_bytes: bytes, ext="jpg"):
         f.write(file_bytes)
     return path
 
-def upscale_image_for_detection(img_path, scale=2.0, interpolation=cv2.INTER_CUBIC):
+def upscale_image_for_detection(img_path, scale=2.0, interpolation=cv2.INTER_CUBIC, output_path=None):
     img = cv2.imread(img_path)
     if img is None:
         raise ValueError("cannot read image for resizing")
@@ -38,9 +38,10 @@ def upscale_image_for_detection(img_path, scale=2.0, interpolation=cv2.INTER_CUB
         interpolation=interpolation
     )
 
-    logger.info(f"[Preprocess] Resized image saved → {img_path}")
-    cv2.imwrite(img_path, resized)
-    return img_path
+    output_path = output_path or img_path
+    logger.info(f"[Preprocess] Resized image saved → {output_path}")
+    cv2.imwrite(output_path, resized)
+    return output_path
 
 def mask_to_detected_boxes(img_path, predictions, output_path=CLEANED_IMAGE_PATH):
     image = cv2.imread(img_path)
@@ -2,6 +2,8 @@ import os
 import logging
 from inference_sdk import InferenceHTTPClient
 
+from api.metrics import count_model_call
+
 API_URL = os.environ.get("ROBOFLOW_API_URL")
 API_KEY = os.environ.get("ROBOFLOW_API_KEY")
 MODEL_ID = os.environ.get("ROBOFLOW_MODEL_ID")
@@ -19,6 +21,7 @@ def run_detection(image_path, model_id=None):
     logger.info(f"[Detect] Running detection on: {image_path}")
     client = _get_client()
     mid = model_id or MODEL_ID
+    count_model_call("roboflow_detection")
     result = client.infer(image_path, model_id=mid)
     return result
 
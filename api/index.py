@@ -1,26 +1,81 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import asyncio
+import os
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
-from api.types.types import ApiResponse
-from .supabase_client import supabase
-
-# IMPORTANT: import the NEW pipeline, not the old one
-from api.image.pipeline import process_image_resume
-from api.pdf.pipeline import process_pdf_resume
+from api.types.types import ApiResponse, BatchItemResponse
+from .supabase_client import supabase, close_async_supabase
 
-from api.services.ranking_service import rank_application
+from api.services.ranking_service import (
+    rank_application,
+    rank_job,
+    top_candidates,
+    index_resume,
+    invalidate_job_plan,
+)
 
 from api.logging_config import setup_logging
+# Pipelines (docling, BERT, GLiNER, image models) are imported lazily by the
+# workers, and only for the pipelines listed in ENABLED_PIPELINES
+from api.workers import (
+    start_workers,
+    shutdown_workers,
+    run_in_worker,
+    workers_enabled,
+    pipeline_enabled,
+    process_resume,
+    process_pdf_files,
+)
+from api.preload import readiness, warm_models
+from api import metrics, progress
+from api.jobs import JobStore, JobRunner
+from api.cache import process_with_cache, result_cache
+from api.settings import BATCH_MAX_FILES, RANK_TOP_K_MAX
+from api.admission import AdmissionLimiter, pdf_limiter, image_limiter, batch_limiter, rank_limiter
+from api.uploads import SpooledUpload, UploadSizeLimitMiddleware, spool_upload
 
 setup_logging(debug=True)
 
 logger = logging.getLogger("api.index")
 
+job_runner = JobRunner(JobStore())
+
+
+async def warm_in_process():
+    """Without a worker pool the API process runs the pipelines, so it warms its own models."""
+    report = await asyncio.to_thread(warm_models)
+    readiness.record(f"api-{os.getpid()}", report)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_workers()
+    warmup_task = None
+    if not workers_enabled():
+        readiness.expect(1)
+        warmup_task = asyncio.create_task(warm_in_process())
+
+    job_runner.start()
+    yield
+    await job_runner.stop()
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+    shutdown_workers()
+    await close_async_supabase()
+
+
 app = FastAPI(
     title="AI Resume Processing API",
     version="1.0",
-    docs_url="/api/py/docs"
+    docs_url="/api/py/docs",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,6 +86,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Rejects oversized uploads before the multipart body is parsed
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# PDF layout backend per request ("auto" | "pymupdf" | "docling"); default LAYOUT_BACKEND
+LAYOUT_QUERY = Query(None, pattern="^(auto|pymupdf|docling)$")
+
+
+def require_pipeline(kind: str):
+    if not pipeline_enabled(kind):
+        raise HTTPException(status_code=503, detail=f"The {kind} pipeline is not enabled on this server")
+
+
+def require_kind(upload: SpooledUpload, kind: str):
+    if upload.kind != kind:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Expected a {kind} file but {upload.filename} is a {upload.kind} file",
+        )
+
+
 @app.get("/")
 def root():
     return {"status": "✅ FastAPI backend running locally"}
@@ -39,6 +114,20 @@ def root():
 def health():
     return {"ok": True, "service": "fastapi"}
 
+@app.get("/api/py/ready")
+def ready():
+    """Readiness probe: 200 once every model is loaded and warm, 503 until then."""
+    snapshot = readiness.snapshot()
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content=snapshot,
+    )
+
+@app.get("/api/py/metrics")
+def prometheus_metrics():
+    """Per-stage latency histograms and model-invocation counts (Prometheus text format)."""
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/py/test-supabase")
 async def test_supabase():
     try:
@@ -61,51 +150,327 @@ async def test_supabase():
 async def api_process_image(file: UploadFile = File(...)) -> ApiResponse:
     if not file:
         raise HTTPException(status_code=400, detail="File is required")
+    require_pipeline("image")
 
-    try:
-        tmp_bytes = await file.read()
-        logger.info(f"[IMAGE] Received file: {file.filename}")
+    async with image_limiter.admit():
+        upload = None
+        try:
+            upload = await spool_upload(file)
+            require_kind(upload, "image")
+            logger.info(f"[IMAGE] Received file: {file.filename}")
 
-        result = process_image_resume(tmp_bytes)
+            result = await process_with_cache("image", upload.path, upload.sha256)
 
-        logger.info("[IMAGE] Pipeline completed successfully")
-        return result
+            logger.info("[IMAGE] Pipeline completed successfully")
+            return result
 
-    except Exception as e:
-        logger.error(f"[IMAGE] Pipeline error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        except HTTPException:
+            raise
+
+        except Exception as e:
+            logger.error(f"[IMAGE] Pipeline error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        finally:
+            if upload is not None:
+                upload.cleanup()
 
 
 # ----------------------
 # PDF PIPELINE
 # ----------------------
 @app.post("/api/py/process-pdf")
-async def api_process_pdf(file: UploadFile = File(...)) -> ApiResponse:
+async def api_process_pdf(file: UploadFile = File(...), layout: Optional[str] = LAYOUT_QUERY) -> ApiResponse:
     
+    if not file:
+        raise HTTPException(status_code=400, detail="File is required")
+    require_pipeline("pdf")
+
+    async with pdf_limiter.admit():
+        upload = None
+        try:
+            upload = await spool_upload(file)
+            require_kind(upload, "pdf")
+            logger.info(f"[PDF] Received file: {file.filename}")
+
+            result = await process_with_cache("pdf", upload.path, upload.sha256, layout=layout)
+
+            logger.info("[PDF] Pipeline completed successfully")
+            return result
+
+        except HTTPException:
+            raise
+
+        except Exception as e:
+            logger.error(f"[PDF] Pipeline error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        finally:
+            if upload is not None:
+                upload.cleanup()
+
+
+# ----------------------
+# STREAMING (Server-Sent Events)
+# ----------------------
+async def stream_resume(
+    kind: str,
+    file: UploadFile,
+    limiter: AdmissionLimiter,
+    layout: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Run one resume and stream its progress as SSE: a "stage" event per finished
+    stage, partial results ("candidate", "skills", ..., "resume") as soon as they
+    exist, then "complete" with the full ApiResponse (or "error").
+    """
+    if not file:
+        raise HTTPException(status_code=400, detail="File is required")
+    require_pipeline(kind)
+
+    # Admission and upload errors are still plain HTTP errors, before the stream starts
+    resources = AsyncExitStack()
+    try:
+        await resources.enter_async_context(limiter.admit())
+        upload = await spool_upload(file)
+        resources.callback(upload.cleanup)
+        require_kind(upload, kind)
+    except BaseException:
+        await resources.aclose()
+        raise
+
+    stream_id = uuid.uuid4().hex
+    logger.info(f"[STREAM] Received {kind} file: {file.filename} (stream {stream_id})")
+
+    async def run() -> ApiResponse:
+        # The run owns the slot and the spool file, so a client that
+        # disconnects early cannot free them while a worker still reads it
+        async with resources:
+            return await process_with_cache(kind, upload.path, upload.sha256, stream_id, layout)
+
+    async def events():
+        with progress.listen(stream_id) as queue:
+            task = asyncio.create_task(run())
+            yield progress.format_sse("started", {"filename": file.filename, "kind": kind})
+
+            while True:
+                if not task.done():
+                    next_event = asyncio.ensure_future(queue.get())
+                    await asyncio.wait({next_event, task}, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_event.done():
+                        next_event.cancel()
+                        continue
+                    event, data = next_event.result()
+
+                elif task.cancelled() or task.exception() is not None:
+                    # A failed run may never send the end marker
+                    while not queue.empty():
+                        event, data = queue.get_nowait()
+                        if event != progress.END_EVENT:
+                            yield progress.format_sse(event, data)
+                    break
+
+                else:
+                    # The result can beat the run's last events, which come over
+                    # the workers' status queue; read on until the end marker
+                    try:
+                        event, data = await asyncio.wait_for(queue.get(), progress.END_TIMEOUT_SECONDS)
+                    except asyncio.TimeoutError:
+                        logger.warning(f"[STREAM] No end of stream {stream_id}; completing without it")
+                        break
+
+                if event == progress.END_EVENT:
+                    break
+                yield progress.format_sse(event, data)
+
+            try:
+                result = await task
+                yield progress.format_sse("complete", result.model_dump(mode="json"))
+            except Exception as e:
+                logger.error(f"[STREAM] Pipeline error: {e}")
+                yield progress.format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/py/process-pdf/stream")
+async def api_process_pdf_stream(file: UploadFile = File(...), layout: Optional[str] = LAYOUT_QUERY):
+    return await stream_resume("pdf", file, pdf_limiter, layout)
+
+
+@app.post("/api/py/process-image/stream")
+async def api_process_image_stream(file: UploadFile = File(...)):
+    return await stream_resume("image", file, image_limiter)
+
+
+# ----------------------
+# BATCH PIPELINE
+# ----------------------
+@app.post("/api/py/process-batch")
+async def api_process_batch(
+    files: List[UploadFile] = File(...),
+    layout: Optional[str] = LAYOUT_QUERY,
+) -> List[BatchItemResponse]:
+    if not files:
+        raise HTTPException(status_code=400, detail="At least one file is required")
+
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_FILES} files per batch")
+
+    async with batch_limiter.admit():
+        uploads: List[SpooledUpload] = []
+        try:
+            for file in files:
+                uploads.append(await spool_upload(file))
+            for kind in {upload.kind for upload in uploads}:
+                require_pipeline(kind)
+            logger.info(f"[BATCH] Received {len(uploads)} files")
+
+            results: List[ApiResponse] = [None] * len(uploads)
+            cache_keys = [None] * len(uploads)
+
+            # Files seen before are answered from the result cache
+            if result_cache is not None:
+                for i, upload in enumerate(uploads):
+                    cache_keys[i] = result_cache.key_for(upload.kind, upload.sha256, layout if upload.kind == "pdf" else None)
+                    results[i] = await asyncio.to_thread(result_cache.get, cache_keys[i])
+
+            pdf_indices = [i for i, upload in enumerate(uploads) if upload.kind == "pdf" and results[i] is None]
+            image_indices = [i for i, upload in enumerate(uploads) if upload.kind == "image" and results[i] is None]
+
+            # All PDFs share one batched run; images fan out across the pool
+            tasks = [run_in_worker(process_resume, "image", uploads[i].path) for i in image_indices]
+            if pdf_indices:
+                tasks.append(run_in_worker(process_pdf_files, [uploads[i].path for i in pdf_indices], layout))
+
+            outputs = await asyncio.gather(*tasks)
+
+            fresh = list(zip(image_indices, outputs))
+            if pdf_indices:
+                fresh.extend(zip(pdf_indices, outputs[-1]))
+
+            for i, result in fresh:
+                results[i] = result
+                if result_cache is not None and result.status == "success" and result.redacted_file_url:
+                    await asyncio.to_thread(result_cache.put, cache_keys[i], result)
+
+            logger.info("[BATCH] Pipeline completed successfully")
+            return [
+                BatchItemResponse(filename=upload.filename, result=result)
+                for upload, result in zip(uploads, results)
+            ]
+
+        except HTTPException:
+            raise
+
+        except Exception as e:
+            logger.error(f"[BATCH] Pipeline error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        finally:
+            for upload in uploads:
+                upload.cleanup()
+
+
+# ----------------------
+# ASYNC JOBS (submit / poll)
+# ----------------------
+@app.post("/api/py/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def api_submit_job(file: UploadFile = File(...)):
     if not file:
         raise HTTPException(status_code=400, detail="File is required")
 
+    upload = None
     try:
-        tmp_bytes = await file.read()
-        logger.info(f"[PDF] Received file: {file.filename}")
+        upload = await spool_upload(file)
+        require_pipeline(upload.kind)
+
+        # The job store keeps its own durable copy of the payload
+        payload = await asyncio.to_thread(upload.read_bytes)
+        job = await job_runner.submit(upload.kind, file.filename, payload)
 
-        result = process_pdf_resume(tmp_bytes)
+        logger.info(f"[JOBS] Queued {upload.kind} file {file.filename} as job {job['job_id']}")
+        return job
 
-        logger.info("[PDF] Pipeline completed successfully")
-        return result
+    except HTTPException:
+        raise
 
     except Exception as e:
-        logger.error(f"[PDF] Pipeline error: {e}")
+        logger.error(f"[JOBS] Submit error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    finally:
+        if upload is not None:
+            upload.cleanup()
+
+
+@app.get("/api/py/jobs/{job_id}")
+async def api_get_job(job_id: str):
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 
 # ----------------------
 # RANKING
 # ----------------------
 @app.post("/api/py/rank/application/{application_id}")
 async def api_rank_application(application_id: int):
+    async with rank_limiter.admit():
+        try:
+            return await rank_application(application_id)
+        except Exception as e:
+            logger.error(f"[RANK] Error ranking application {application_id}: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/py/rank/job/{job_id}")
+async def api_rank_job(
+    job_id: int,
+    mode: Optional[str] = Query(None, pattern="^(fuzzy|tfidf)$"),
+    top: Optional[int] = Query(None, ge=1, le=RANK_TOP_K_MAX),
+):
+    """
+    Re-score and store a job's applicants. ``top`` (only the best ``top``) and a
+    ``mode`` other than RANK_SCORING_MODE return scores without storing them.
+    """
+    async with rank_limiter.admit():
+        try:
+            return await rank_job(job_id, mode, top)
+        except Exception as e:
+            logger.error(f"[RANK] Error ranking job {job_id}: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/py/rank/job/{job_id}/top")
+async def api_rank_job_top(
+    job_id: int,
+    k: int = Query(20, ge=1, le=RANK_TOP_K_MAX),
+    mode: Optional[str] = Query(None, pattern="^(fuzzy|tfidf)$"),
+):
+    async with rank_limiter.admit():
+        try:
+            return await top_candidates(job_id, k, mode)
+        except Exception as e:
+            logger.error(f"[RANK] Error finding top candidates for job {job_id}: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/py/rank/index/resume/{resume_id}")
+async def api_index_resume(resume_id: int):
     try:
-        return await rank_application(application_id)
+        return await index_resume(resume_id)
     except Exception as e:
-        logger.error(f"[RANK] Error ranking application {application_id}: {e}")
+        logger.error(f"[RANK] Error indexing resume {resume_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/py/rank/job/{job_id}/invalidate")
+def api_invalidate_job_plan(job_id: int):
+    """Called after a recruiter edits a job's requirements."""
+    return invalidate_job_plan(job_id)
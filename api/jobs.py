@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from api.settings import JOBS_DB_PATH, JOBS_RETENTION_SECONDS, RESUME_WORKERS
+from api.types.types import ApiResponse
+from api.cache import process_with_cache
+
+logger = logging.getLogger("api.jobs")
+
+
+# =============================================================================
+# SQLite Job Store
+# =============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_job (
+    job_id      TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    filename    TEXT,
+    file_hash   TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    payload     BLOB,
+    result      TEXT,
+    message     TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_job_status ON resume_job (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_resume_job_hash ON resume_job (file_hash, status);
+"""
+
+# queued -> processing -> done | error
+ACTIVE_STATUSES = ("queued", "processing")
+
+
+class JobStore:
+    """
+    Durable queue of resume-processing jobs.
+
+    Every method opens its own short-lived connection, so the store can be
+    used from any thread (the API calls it through ``asyncio.to_thread``).
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, kind: str, filename: Optional[str], file_bytes: bytes) -> Dict[str, Any]:
+        """
+        Queue a file and return its job. An identical file that is still
+        queued or processing returns the existing job instead of a duplicate.
+        """
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = conn.execute(
+                    "SELECT job_id, status FROM resume_job "
+                    "WHERE file_hash = ? AND kind = ? AND status IN (?, ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (file_hash, kind, *ACTIVE_STATUSES),
+                ).fetchone()
+
+                if existing:
+                    conn.execute("COMMIT")
+                    return {"job_id": existing["job_id"], "status": existing["status"]}
+
+                job_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO resume_job "
+                    "(job_id, kind, filename, file_hash, status, payload, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                    (job_id, kind, filename, file_hash, sqlite3.Binary(file_bytes), now, now),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return {"job_id": job_id, "status": "queued"}
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to processing and return it."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id, kind, payload FROM resume_job "
+                    "WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    "UPDATE resume_job SET status = 'processing', updated_at = ? WHERE job_id = ?",
+                    (time.time(), row["job_id"]),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return {"job_id": row["job_id"], "kind": row["kind"], "payload": bytes(row["payload"])}
+
+    def complete(self, job_id: str, result: ApiResponse):
+        status = "done" if result.status == "success" else "error"
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE resume_job SET status = ?, result = ?, message = ?, payload = NULL, updated_at = ? "
+                "WHERE job_id = ?",
+                (status, result.model_dump_json(), result.message, time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, message: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE resume_job SET status = 'error', message = ?, payload = NULL, updated_at = ? "
+                "WHERE job_id = ?",
+                (message, time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, kind, filename, status, result, message, created_at, updated_at "
+                "FROM resume_job WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "job_id": row["job_id"],
+            "kind": row["kind"],
+            "filename": row["filename"],
+            "status": row["status"],
+            "result": ApiResponse.model_validate_json(row["result"]) if row["result"] else None,
+            "message": row["message"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def requeue_interrupted(self) -> int:
+        """Jobs left in processing by a crashed/restarted process go back to the queue."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE resume_job SET status = 'queued', updated_at = ? WHERE status = 'processing'",
+                (time.time(),),
+            )
+            return cur.rowcount
+
+    def purge_finished(self, older_than_seconds: int = JOBS_RETENTION_SECONDS) -> int:
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM resume_job WHERE status IN ('done', 'error') AND updated_at < ?",
+                (cutoff,),
+            )
+            return cur.rowcount
+
+
+# =============================================================================
+# Queue Drainers
+# =============================================================================
+
+class JobRunner:
+    """Background tasks that drain the job store into the worker pool."""
+
+    def __init__(self, store: JobStore, concurrency: int = max(RESUME_WORKERS, 1)):
+        self.store = store
+        self.concurrency = concurrency
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.info(f"[Jobs] Re-queued {requeued} interrupted jobs")
+
+        purged = self.store.purge_finished()
+        if purged:
+            logger.info(f"[Jobs] Purged {purged} finished jobs")
+
+        self._tasks = [asyncio.create_task(self._drain()) for _ in range(self.concurrency)]
+        self._wakeup.set()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def submit(self, kind: str, filename: Optional[str], file_bytes: bytes) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.submit, kind, filename, file_bytes)
+        self.notify()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _drain(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+
+            if job is None:
+                # Nothing queued: sleep until a submit wakes us (poll as a safety net)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id = job["job_id"]
+            logger.info(f"[Jobs] Processing job {job_id} ({job['kind']})")
+
+            try:
+                result = await process_with_cache(job["kind"], job["payload"])
+                await asyncio.to_thread(self.store.complete, job_id, result)
+                logger.info(f"[Jobs] Job {job_id} finished with status {result.status}")
+
+            except asyncio.CancelledError:
+                # Shutdown mid-job: leave it in processing so the next start re-queues it
+                raise
+
+            except Exception as e:
+                logger.error(f"[Jobs] Job {job_id} failed: {e}")
+                await asyncio.to_thread(self.store.fail, job_id, str(e))
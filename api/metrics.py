@@ -0,0 +1,265 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from api import progress
+
+# =============================================================================
+# Minimal Prometheus Metrics (text exposition format 0.0.4)
+# =============================================================================
+
+# Pipeline stages range from milliseconds (regex passes) to minutes (docling on a cold box)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = self.header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = self.header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> (bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        lines = self.header()
+        for key, (counts, total, count) in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {bucket_count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =============================================================================
+# Resume Pipeline Metrics
+# =============================================================================
+
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "resume_pipeline_stage_seconds",
+    "Wall time of each resume pipeline stage.",
+    ["pipeline", "stage"],
+)
+
+PIPELINE_SECONDS = registry.histogram(
+    "resume_pipeline_seconds",
+    "End-to-end wall time of a resume pipeline run.",
+    ["pipeline", "status"],
+)
+
+MODEL_INVOCATIONS = registry.counter(
+    "resume_model_invocations_total",
+    "Number of model inference calls (one batched call counts once).",
+    ["model"],
+)
+
+
+# =============================================================================
+# Recording (forwarded to the API process when running inside a worker)
+# =============================================================================
+
+# Set in pool workers so observations reach the API process that serves /metrics
+_forward: Optional[Callable[[Tuple[Any, ...]], None]] = None
+
+
+def forward_to(sink: Optional[Callable[[Tuple[Any, ...]], None]]):
+    global _forward
+    _forward = sink
+
+
+def apply_event(event: Tuple[Any, ...]):
+    """Apply an observation event ("metric", kind, name, value, labels) to the local registry."""
+    _, kind, name, value, labels = event
+    metric = registry.get(name)
+    if metric is None:
+        return
+    if kind == "observe":
+        metric.observe(value, **labels)
+    elif kind == "inc":
+        metric.inc(value, **labels)
+
+
+def _record(kind: str, metric: _Metric, value: float, labels: Dict[str, Any]):
+    event = ("metric", kind, metric.name, value, labels)
+    if _forward is not None:
+        try:
+            _forward(event)
+            return
+        except Exception:
+            # Never fail a resume because metrics could not be shipped
+            pass
+    apply_event(event)
+
+
+def observe_stage(pipeline: str, stage_name: str, seconds: float):
+    _record("observe", PIPELINE_STAGE_SECONDS, seconds, {"pipeline": pipeline, "stage": stage_name})
+
+
+def observe_pipeline(pipeline: str, status: str, seconds: float):
+    _record("observe", PIPELINE_SECONDS, seconds, {"pipeline": pipeline, "status": status})
+
+
+def count_model_call(model: str, calls: int = 1):
+    _record("inc", MODEL_INVOCATIONS, calls, {"model": model})
+
+
+@contextmanager
+def stage(pipeline: str, stage_name: str) -> Iterator[None]:
+    """Time a pipeline stage with a monotonic clock (and report it to a progress stream, if any)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        observe_stage(pipeline, stage_name, seconds)
+
+    progress.emit("stage", {"pipeline": pipeline, "stage": stage_name, "seconds": round(seconds, 3)})
+
+
+def count_calls(obj: Any, method_name: str, model: str):
+    """Wrap ``obj.method_name`` on this instance so every call is counted for ``model``."""
+    method = getattr(obj, method_name)
+
+    def counted(*args, **kwargs):
+        count_model_call(model)
+        return method(*args, **kwargs)
+
+    setattr(obj, method_name, counted)
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List, Pattern, Set
+from typing import Dict, List, Pattern, Set, Tuple
 
 # =============================================================================
 # Model Configuration
@@ -8,9 +8,64 @@ from typing import Dict, List, Pattern, Set
 # BERT model for section classification
 SECTION_CLASSIFIER_MODEL: str = "has-abi/bert-finetuned-resumes-sections"
 
+# Inference backend for the section classifier: "torch" = PyTorch eager,
+# "onnx" = int8 dynamically quantized ONNX Runtime session on CPU (exported
+# once to MODEL_ARTIFACT_DIR). Check label agreement with
+# `python -m api.pdf.section_parity` before switching.
+SECTION_CLASSIFIER_BACKENDS: Tuple[str, ...] = ("torch", "onnx")
+SECTION_CLASSIFIER_BACKEND: str = "torch"
+
+# BERT inputs are truncated to this many tokens; unresolved groups are sorted by
+# token length and classified this many per padded forward pass
+SECTION_CLASSIFIER_MAX_TOKENS: int = 512
+SECTION_CLASSIFIER_BATCH_SIZE: int = 32
+
+# Model labels never returned by the classifier (the next best label wins)
+SECTION_EXCLUDED_LABELS: Set[str] = {"para"}
+
 # GLiNER model for entity extraction
 GLINER_MODEL_NAME: str = "urchade/gliner_small-v2.1"
 
+# =============================================================================
+# Layout Backend
+# =============================================================================
+
+# "docling" = spaCyLayout (docling) for every PDF; "pymupdf" = PyMuPDF text
+# layer whenever the document has one; "auto" = PyMuPDF for born-digital,
+# single-column documents and docling for everything else
+LAYOUT_BACKENDS: Tuple[str, ...] = ("auto", "pymupdf", "docling")
+LAYOUT_BACKEND: str = "auto"
+
+# Fewer extractable characters than this in the document means no usable
+# text layer (scanned or image-only PDF)
+MIN_TEXT_LAYER_CHARS: int = 200
+
+# More U+FFFD / unmapped glyphs than this share of the text means a broken font encoding
+MAX_UNMAPPED_CHAR_RATIO: float = 0.02
+
+# "auto" hands a page to docling when at least this share of its text sits in
+# a column beside another one
+MULTI_COLUMN_TEXT_RATIO: float = 0.2
+
+# A line is a heading candidate when its font is this much larger than the body font...
+HEADING_SIZE_RATIO: float = 1.15
+# ...or when it is bold / all caps, short, and this many body-font lines below the previous line
+HEADING_GAP_RATIO: float = 0.6
+HEADING_MAX_WORDS: int = 6
+
+# Lines within this share of the page height from the top or bottom edge that
+# repeat on another page are running headers/footers (the top of the first
+# page is the resume's own header, never a running one)
+RUNNING_MARGIN_RATIO: float = 0.1
+
+# Glyphs that start a list item
+BULLET_GLYPHS: Set[str] = {
+    "\u2022", "\u25cf", "\u25cb", "\u25e6", "\u25aa", "\u25a0", "\u25a1", "\u25c6", "\u25c7",
+    "\u25ba", "\u25b8", "\u2023", "\u2043", "\u00b7", "\u2713", "\u2714", "\u27a2", "\u27a4",
+    "\uf0b7", "\uf0a7", "\uf076", "\uf0d8",  # Symbol / Wingdings bullets exported by Word
+    "-", "\u2013", "\u2014", "*",  # only when followed by a space
+}
+
 # =============================================================================
 # Section Merge Mapping
 # =============================================================================
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+# =============================================================================
+# Per-request PDF Document
+# =============================================================================
+
+class PdfDocument:
+    """
+    One resume PDF for the length of a request: its bytes are read once and
+    opened once in memory, and every stage (text layer, docling, face
+    detection, redaction) works from this object instead of a file.
+    Redaction edits ``doc`` in place, so it runs last.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.doc = fitz.open(stream=data, filetype="pdf")
+
+    @classmethod
+    def from_path(cls, pdf_path: str) -> "PdfDocument":
+        return cls(Path(pdf_path).read_bytes())
+
+    def close(self):
+        self.doc.close()
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,8 +1,10 @@
 import re
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Tuple
 
 from gliner import GLiNER
 
+from api.metrics import count_calls
 from api.pdf.config import GLINER_MODEL_NAME, DEGREE_RES
 from api.types.types import ResumeData, TextGroup, EducationOut, ExperienceOut, CertificationOut, ActivityOut
 
@@ -21,10 +23,78 @@ def load_ner_model():
     
     print(f"[GLiNER] Loading model: {GLINER_MODEL_NAME}")
     ner_model = GLiNER.from_pretrained(GLINER_MODEL_NAME)
+
+    # Count every inference call for /api/py/metrics
+    count_calls(ner_model, "predict_entities", "gliner")
+    count_calls(ner_model, "batch_predict_entities", "gliner")
     print("[GLiNER] Model loaded successfully.")
     return ner_model
 
 
+def predict_entities_batch(texts: List[str], labels: List[str], threshold: float = 0.5) -> List[List[dict]]:
+    """Run GLiNER over many texts with one batched call (one result list per text)."""
+    if not texts:
+        return []
+
+    model = load_ner_model()
+    return model.batch_predict_entities(texts, labels, threshold=threshold)
+
+
+# =============================================================================
+# Batched Section Builders
+# =============================================================================
+#
+# Each section builder is a generator: it yields a list of NER requests
+# (text, labels, threshold), is sent back one entity list per request, and
+# finally returns its section. run_ner_builders advances the builders of
+# every document in lockstep, so each round costs one batched GLiNER call
+# per (labels, threshold) instead of one call per span or record.
+
+NerRequest = Tuple[str, Sequence[str], float]
+NerBuilder = Generator[List[NerRequest], List[List[dict]], Any]
+
+DEFAULT_NER_THRESHOLD = 0.5
+
+
+def run_ner_builders(
+    builders: List[NerBuilder],
+    on_done: Optional[Callable[[int, Any], None]] = None,
+) -> List[Any]:
+    """Run section builders together; returns their sections in order, calling ``on_done(i, section)`` as each finishes."""
+    results: List[Any] = [None] * len(builders)
+    pending: Dict[int, List[NerRequest]] = {}
+
+    def advance(i: int, answer: Optional[List[List[dict]]]):
+        try:
+            pending[i] = builders[i].send(answer)
+        except StopIteration as stop:
+            pending.pop(i, None)
+            results[i] = stop.value
+            if on_done is not None:
+                on_done(i, stop.value)
+
+    for i in range(len(builders)):
+        advance(i, None)
+
+    while pending:
+        # (labels, threshold) -> [(builder, request position, text)]
+        calls: Dict[Tuple[Tuple[str, ...], float], List[Tuple[int, int, str]]] = defaultdict(list)
+        for i, requests in pending.items():
+            for j, (text, labels, threshold) in enumerate(requests):
+                calls[(tuple(labels), threshold)].append((i, j, text))
+
+        answers = {i: [[] for _ in requests] for i, requests in pending.items()}
+        for (labels, threshold), items in calls.items():
+            entities = predict_entities_batch([text for _, _, text in items], list(labels), threshold)
+            for (i, j, _), found in zip(items, entities):
+                answers[i][j] = found
+
+        for i in list(pending):
+            advance(i, answers[i])
+
+    return results
+
+
 # =============================================================================
 # Record Splitting (split by headers)
 # =============================================================================
@@ -274,7 +344,7 @@ def is_skill_sentence(text: str) -> bool:
 # Skills Building
 # =============================================================================
 
-def build_skills(groups: List['TextGroup']) -> List[str]:
+def build_skills(groups: List['TextGroup']) -> NerBuilder:
     skill_groups = [group for group in groups if group.heading == "skills"]
     
     if not skill_groups:
@@ -287,6 +357,14 @@ def build_skills(groups: List['TextGroup']) -> List[str]:
     skills = []
     seen_skills = set()  # Stores lowercased versions for deduplication
 
+    # Entities of every span that needs NER, in one batched request
+    ner_spans = [
+        span for span in skill_group.spans
+        if not (span.label == "list_item" and not is_skill_sentence(span.text))
+    ]
+    ner_results = yield [(span.text, ["skill", "tool", "language"], DEFAULT_NER_THRESHOLD) for span in ner_spans]
+    span_entities = {id(span): entities for span, entities in zip(ner_spans, ner_results)}
+
     for span in skill_group.spans:
         # --- Path A: Simple List Items ---
         if span.label == "list_item" and not is_skill_sentence(span.text):
@@ -300,7 +378,7 @@ def build_skills(groups: List['TextGroup']) -> List[str]:
 
         # --- Path B: Complex Sentences (NER) ---
         else:
-            entities = ner_model.predict_entities(span.text, ["skill", "tool", "language"])
+            entities = span_entities[id(span)]
             for entity in entities:
                 clean_text = entity['text'].strip()
                 lower_text = clean_text.lower()
@@ -317,12 +395,11 @@ def build_skills(groups: List['TextGroup']) -> List[str]:
 # Education Building
 # =============================================================================
 
-def build_educations(groups: List[TextGroup]) -> List[EducationOut]:
+def build_educations(groups: List[TextGroup]) -> NerBuilder:
     edu_group = [group for group in groups if group.heading == "education"]
     if not edu_group:
         return []
     edu_group = edu_group[0]
-    ner_model = load_ner_model()
 
     # =========================================================================
     # STEP 1: Strict Structural Split (Span Labels)
@@ -337,7 +414,7 @@ def build_educations(groups: List[TextGroup]) -> List[EducationOut]:
     if not records:
         edu_text = edu_group.text
 
-        entities = ner_model.predict_entities(edu_text, ["academic degree", "school", "university", "organization"])
+        (entities,) = yield [(edu_text, ["academic degree", "school", "university", "organization"], DEFAULT_NER_THRESHOLD)]
 
         # Create a new list for valid entities
         valid_entities = []
@@ -382,13 +459,14 @@ def build_educations(groups: List[TextGroup]) -> List[EducationOut]:
     # =========================================================================
     final_education_entries = []
 
+    # Re-run NER on each segment to get precise associations (one batched request)
+    record_entities = yield [
+        (record, ["academic degree", "school", "university", "organization", "location"], DEFAULT_NER_THRESHOLD)
+        for record in records
+    ]
+
     # 2. Process each record to build the Object
-    for record in records:
-        # Re-run NER on this specific segment to get precise associations
-        segment_entities = ner_model.predict_entities(
-            record, 
-            ["academic degree", "school", "university", "organization", "location"]
-        )
+    for record, segment_entities in zip(records, record_entities):
         
         # Initialize a temporary dictionary to hold our best candidates
         current_data = {
@@ -441,7 +519,7 @@ def build_educations(groups: List[TextGroup]) -> List[EducationOut]:
 # Experience Building
 # =============================================================================
 
-def build_experiences(groups: List[TextGroup]) -> List[ExperienceOut]:
+def build_experiences(groups: List[TextGroup]) -> NerBuilder:
     exp_groups = [group for group in groups if group.heading == "experience"]
     
     if not exp_groups:
@@ -449,7 +527,6 @@ def build_experiences(groups: List[TextGroup]) -> List[ExperienceOut]:
         return []
     
     exp_group = exp_groups[0]
-    ner_model = load_ner_model()
 
     # =========================================================================
     # STEP 1: Strict Structural Split (Span Labels)
@@ -464,7 +541,7 @@ def build_experiences(groups: List[TextGroup]) -> List[ExperienceOut]:
     if not records:
         exp_text = exp_group.text
 
-        entities = ner_model.predict_entities(exp_text, ["job title", "company", "organization"])
+        (entities,) = yield [(exp_text, ["job title", "company", "organization"], DEFAULT_NER_THRESHOLD)]
 
         job_titles = [e["text"] for e in entities if e['label'] == 'job title']
         companies = [e["text"] for e in entities if e['label'] in {'company', 'organization'}]
@@ -492,13 +569,14 @@ def build_experiences(groups: List[TextGroup]) -> List[ExperienceOut]:
     # =========================================================================
     final_experience_entries = []
 
+    # Re-run NER on each segment to get precise associations (one batched request)
+    record_entities = yield [
+        (record, ["job title", "company", "organization", "location"], DEFAULT_NER_THRESHOLD)
+        for record in records
+    ]
+
     # 2. Process each record to build the Object
-    for record in records:
-        # Re-run NER on this specific segment to get precise associations
-        segment_entities = ner_model.predict_entities(
-            record, 
-            ["job title", "company", "organization", "location"]
-        )
+    for record, segment_entities in zip(records, record_entities):
         
         # Initialize a temporary dictionary to hold our best candidates
         current_data = {
@@ -550,18 +628,20 @@ def build_experiences(groups: List[TextGroup]) -> List[ExperienceOut]:
 # Certifications Building
 # =============================================================================
 
-def build_certifications(groups: List[TextGroup]) -> List[CertificationOut]:
+def build_certifications(groups: List[TextGroup]) -> NerBuilder:
     cert_groups = [group for group in groups if group.heading == "certifications"]
     cert_out = []
 
     if not cert_groups:
         return cert_out
-    
-    ner_model = load_ner_model()
 
-    for cert_group in cert_groups:
-        # 1. Extract entities
-        entities = ner_model.predict_entities(cert_group.text, ["award name", "issuing organization", "description"], threshold=0.3)
+    # 1. Extract entities of every group (one batched request)
+    group_entities = yield [
+        (cert_group.text, ["award name", "issuing organization", "description"], 0.3)
+        for cert_group in cert_groups
+    ]
+
+    for entities in group_entities:
         
         # 2. Prepare temporary placeholders
         found_name = None
@@ -591,15 +671,19 @@ def build_certifications(groups: List[TextGroup]) -> List[CertificationOut]:
 # Activities Building
 # =============================================================================
 
-def build_activities(groups: List[TextGroup]) -> List[ActivityOut]:
+def build_activities(groups: List[TextGroup]) -> NerBuilder:
     act_groups = [group for group in groups if group.heading == "activities"]
     act_out = []
     if not act_groups:
         return act_out
-    
-    for act_group in act_groups:
-        # 1. Extract entities
-        entities = ner_model.predict_entities(act_group.text, ["project title", "activity experience", "description"], threshold=0.3)
+
+    # 1. Extract entities of every group (one batched request)
+    group_entities = yield [
+        (act_group.text, ["project title", "activity experience", "description"], 0.3)
+        for act_group in act_groups
+    ]
+
+    for entities in group_entities:
         
         # 2. Prepare temporary placeholders
         found_name = None
@@ -628,23 +712,35 @@ def build_activities(groups: List[TextGroup]) -> List[ActivityOut]:
 # Other Section Building (Skills, Certifications, Activities)
 # =============================================================================
 
-def build_other(groups: List[TextGroup], data: ResumeData) -> ResumeData:
+def build_other(groups: List[TextGroup]) -> NerBuilder:
+    """Skill, certification and activity entities of each 'other' group, for merge_other."""
     other_groups = [group for group in groups if group.heading == "other"]
     if not other_groups:
-        return data
+        return []
 
     # Define the specific label lists
     skill_labels = ["skill", "tool", "language"]
     cert_labels = ["certification", "award"]
     activity_labels = ["activity", "project"]
 
-    ner_model = load_ner_model()
+    # All three passes of every group in one batched request
+    results = yield [
+        (other_group.text, labels, DEFAULT_NER_THRESHOLD)
+        for other_group in other_groups
+        for labels in (skill_labels, cert_labels, activity_labels)
+    ]
+
+    return [
+        (other_group, results[3 * i], results[3 * i + 1], results[3 * i + 2])
+        for i, other_group in enumerate(other_groups)
+    ]
+
 
-    for other_group in other_groups:
+def merge_other(other_entities: list, data: ResumeData) -> ResumeData:
+    for other_group, skill_entities, cert_entities, activity_entities in other_entities:
         print(f"\n[Processing 'other' section: {other_group.text[:50]}...]")
 
         # --- Pass 1: Predict Skills ---
-        skill_entities = ner_model.predict_entities(other_group.text, skill_labels)
         for entity in skill_entities:
             print(f"      • [{entity['label']}] \"{entity['text']}\" (Score: {entity['score']:.2f})")
             # Logic: Add to skills list if not unique
@@ -652,7 +748,6 @@ def build_other(groups: List[TextGroup], data: ResumeData) -> ResumeData:
                 data.skills.append(entity['text'])
 
         # --- Pass 2: Predict Certifications ---
-        cert_entities = ner_model.predict_entities(other_group.text, cert_labels)
         for entity in cert_entities:
             print(f"      • [{entity['label']}] \"{entity['text']}\" (Score: {entity['score']:.2f})")
             # Logic: Create Certification object
@@ -663,7 +758,6 @@ def build_other(groups: List[TextGroup], data: ResumeData) -> ResumeData:
             data.certifications.append(cert_obj)
 
         # --- Pass 3: Predict Activities ---
-        activity_entities = ner_model.predict_entities(other_group.text, activity_labels)
         for entity in activity_entities:
             print(f"      • [{entity['label']}] \"{entity['text']}\" (Score: {entity['score']:.2f})")
             # Logic: Create Activity object
@@ -673,4 +767,4 @@ def build_other(groups: List[TextGroup], data: ResumeData) -> ResumeData:
             )
             data.activities.append(act_obj)
 
-    return data
\ No newline at end of file
+    return data
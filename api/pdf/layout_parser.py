@@ -1,4 +1,4 @@
-from typing import Set, Tuple, List, Optional
+from typing import Set, Tuple, List, Optional, Union
 
 import spacy
 from spacy_layout import spaCyLayout
@@ -43,9 +43,10 @@ def extract_bbox(layout_obj: SpanLayout) -> Optional[Tuple[float, float, float,
 # Load PDF
 # =============================================================================
 
-def load_pdf(pdf_path: str) -> spacy.tokens.Doc:
+def load_pdf(source: Union[str, bytes]) -> spacy.tokens.Doc:
+    """``source`` is a file path or the PDF bytes (parsed from memory)."""
     parser = get_layout_parser()
-    doc = parser(pdf_path)
+    doc = parser(source)
 
     return doc
 
@@ -54,30 +55,51 @@ def load_pdf(pdf_path: str) -> spacy.tokens.Doc:
 # Preprocess PDF
 # =============================================================================
 
+# Docling labels that start a section
+HEADING_LABELS: Set[str] = {"section_header", "title"}
+
+# Running headers/footers repeat on every page; they neither start a section
+# nor belong to the one they interrupt
+RUNNING_LABELS: Set[str] = {"page_header", "page_footer"}
+
+
+def carried_headings(spans: List[spacy.tokens.Span]) -> List[Optional[str]]:
+    """
+    Heading of each span, carried across page breaks: the last section header
+    or title before it. Headers, titles and running headers/footers get None.
+    (spaCyLayout's own ``_.heading`` would let a page header on page 2
+    replace the section heading that continues below it.)
+    """
+    headings: List[Optional[str]] = []
+    current: Optional[str] = None
+
+    for span in spans:
+        if span.label_ in HEADING_LABELS:
+            headings.append(None)
+            current = span.text
+        elif span.label_ in RUNNING_LABELS:
+            headings.append(None)
+        else:
+            headings.append(current)
+
+    return headings
+
+
 def preprocess_layout_doc(doc: spacy.tokens.Doc) -> List[TextSpan]:
     
-    # 1) Filter out non-first-page spans
-    raw_kept_spans = [
-        s for s in doc.spans["layout"]
-        if s._.layout.page_no == 1
-    ]
-
-    # 2) Collect headings that already exist on remaining spans
-    real_headings: Set[str] = set()
-    for span in raw_kept_spans:
-        heading_val = span._.heading
-        if heading_val is not None:
-            heading_str = str(heading_val)
-            if heading_str:
-                real_headings.add(heading_str)
+    # 1) Every page, in reading order
+    raw_kept_spans = list(doc.spans["layout"])
+    span_headings = carried_headings(raw_kept_spans)
+
+    # 2) Collect headings that already exist on the spans
+    real_headings: Set[str] = {heading for heading in span_headings if heading}
 
     # 3) Create TextSpan objects (Fixing empty headings if text matches a real heading)
     results: List[TextSpan] = []
     
-    for span in raw_kept_spans:
+    for span, current_heading_val in zip(raw_kept_spans, span_headings):
         # Determine the current heading string safely
-        current_heading_val = span._.heading
-        final_heading_str = str(current_heading_val) if current_heading_val is not None else ""
+        final_heading_str = current_heading_val or ""
 
         # Logic: If this span has no heading, but its text appears as a heading elsewhere, promote it
         if not final_heading_str:
@@ -91,7 +113,8 @@ def preprocess_layout_doc(doc: spacy.tokens.Doc) -> List[TextSpan]:
             text=span.text,
             label=span.label_,
             heading=final_heading_str,
-            bbox=extract_bbox(span._.layout)
+            bbox=extract_bbox(span._.layout),
+            page=span._.layout.page_no - 1 if span._.layout is not None else 0,
         )
         results.append(layout_span)
 
@@ -1,72 +1,125 @@
 import logging
-import os
-import tempfile
 import traceback
 from pathlib import Path
+from typing import Dict, List, Optional
 
-from api.types.types import ApiResponse
+from api.metrics import stage
+from api.types.types import ApiResponse, TextGroup, TextSpan
 
+from api.pdf.config import LAYOUT_BACKEND, LAYOUT_BACKENDS
+from api.pdf.document import PdfDocument
 from api.pdf.layout_parser import (
     load_pdf,
     group_spans_by_heading,
     preprocess_layout_doc,
 )
-from api.pdf.section_classifier import classify_text_groups, merge_text_groups, remove_common_span_label
+from api.pdf.text_layer import extract_text_spans
+from api.pdf.section_classifier import (
+    classify_text_groups,
+    classify_text_groups_batch,
+    merge_text_groups,
+    remove_common_span_label,
+)
 
-from api.pdf.resume_builder import build_resume_data
-from api.pdf.redaction import detect_person_spans, detect_face_regions, redact_pdf
+from api.pdf.resume_builder import build_resume_data, build_resume_data_batch
+from api.pdf.redaction import detect_person_spans, detect_person_spans_batch, detect_face_regions, redact_pdf
 
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# Layout
+# =============================================================================
+
+def load_text_spans(pdf: PdfDocument, layout: Optional[str], pipeline: str = "pdf") -> List[TextSpan]:
+    """
+    TextSpans of every page from the requested layout backend (LAYOUT_BACKEND by
+    default). The PyMuPDF text layer is tried first unless docling is asked
+    for; docling handles whatever it declines (no text layer, or a
+    multi-column page in "auto" mode).
+    """
+    layout = layout or LAYOUT_BACKEND
+    if layout not in LAYOUT_BACKENDS:
+        raise ValueError(f"Unknown layout backend: {layout}")
+
+    if layout != "docling":
+        with stage(pipeline, "layout_pymupdf"):
+            text_spans = extract_text_spans(pdf.doc, require_simple_layout=(layout == "auto"))
+        if text_spans is not None:
+            return text_spans
+        print("[PDF Pipeline] No simple text layer, falling back to docling...")
+
+    with stage(pipeline, "layout_load"):
+        doc = load_pdf(pdf.data)
+    with stage(pipeline, "preprocess"):
+        return preprocess_layout_doc(doc)
+
+
 # =============================================================================
 # Main Pipeline
 # =============================================================================
 
-def process_pdf_resume(file_bytes: bytes) -> ApiResponse:
+def process_pdf_file(pdf_path: str, layout: Optional[str] = None) -> ApiResponse:
+    """Run the pipeline on a PDF that is already on disk (e.g. the spooled upload); it is read once."""
+    try:
+        file_bytes = Path(pdf_path).read_bytes()
+    except OSError as e:
+        logger.error(f"Error reading {pdf_path}: {e}")
+        return _error_response(e)
+
+    return process_pdf_resume(file_bytes, layout)
 
-    fd, tmp_path = tempfile.mkstemp(suffix=".pdf", prefix="resume_")
-    pdf_path = Path(tmp_path)
-    
+
+def process_pdf_resume(file_bytes: bytes, layout: Optional[str] = None) -> ApiResponse:
+    """
+    Run the pipeline on PDF bytes. The document is opened once, in memory,
+    and shared by every stage; nothing is written to disk.
+    ``layout`` ("auto" | "pymupdf" | "docling") overrides LAYOUT_BACKEND.
+    """
+    pdf = None
     try:
-        # Write PDF to temp file
-        with os.fdopen(fd, "wb") as f:
-            f.write(file_bytes)
-        
-        print("===================== Stage 1: PDF Layout Processing =====================")
-        print("[PDF Pipeline] Step 1: Loading PDF layout...")
-        doc = load_pdf(str(pdf_path))
+        pdf = PdfDocument(file_bytes)
 
-        print("[PDF Pipeline] Step 2: Preprocessing layout document...")
-        text_spans = preprocess_layout_doc(doc)
+        print("===================== Stage 1: PDF Layout Processing =====================")
+        print(f"[PDF Pipeline] Step 1-2: Loading and preprocessing PDF layout ({layout or LAYOUT_BACKEND})...")
+        text_spans = load_text_spans(pdf, layout)
         
         print("[PDF Pipeline] Step 3: Grouping spans by heading (Initial TextGroups)...")
-        groups = group_spans_by_heading(text_spans)
+        with stage("pdf", "grouping"):
+            groups = group_spans_by_heading(text_spans)
         
         print("===================== Stage 2: Section Classification =====================")
-        print("[PDF Pipeline] Step 4: Classifying text groups by section...")
-        groups = classify_text_groups(groups)
+        with stage("pdf", "classification"):
+            print("[PDF Pipeline] Step 4: Classifying text groups by section...")
+            groups = classify_text_groups(groups)
 
-        print("[PDF Pipeline] Step 5: Heading text cleaning...")
-        groups = remove_common_span_label(groups)
+            print("[PDF Pipeline] Step 5: Heading text cleaning...")
+            groups = remove_common_span_label(groups)
 
-        print(f"[PDF Pipeline] Step 6: Merging text groups...")
-        groups = merge_text_groups(groups)
+            print(f"[PDF Pipeline] Step 6: Merging text groups...")
+            groups = merge_text_groups(groups)
         
-        print("===================== Stage 3a: Biased Information Removal =====================")
+        print("===================== Stage 3a: Biased Information Detection =====================")
         print("[PDF Pipeline] Step 7: Detecting person information...")
-        redaction_spans = detect_person_spans(groups)
+        with stage("pdf", "person_detection"):
+            redaction_spans = detect_person_spans(groups)
 
-        print("[PDF Pipeline] Step 8: Detecting face regions...")
-        redaction_spans.extend(detect_face_regions(str(pdf_path)))
-
-        print("[PDF Pipeline] Step 9: Redacting biased information from PDF...")
-        redaction_result = redact_pdf(str(pdf_path), redaction_spans)
-        
+        # Structured data only needs the person spans, so it is built (and
+        # streamed) before the slower redaction and upload
         print("===================== Stage 3b: Skills, Education, Experience NER =====================")
-        print("[PDF Pipeline] Step 10: NER-ing structured resume data...")
-        resume_data = build_resume_data(groups, redaction_spans)
+        print("[PDF Pipeline] Step 8: NER-ing structured resume data...")
+        with stage("pdf", "ner"):
+            resume_data = build_resume_data(groups, redaction_spans)
+
+        print("===================== Stage 4: Biased Information Removal =====================")
+        print("[PDF Pipeline] Step 9: Detecting face regions...")
+        with stage("pdf", "face_detection"):
+            redaction_spans.extend(detect_face_regions(pdf.doc))
+
+        print("[PDF Pipeline] Step 10: Redacting biased information from PDF...")
+        # Times the "redaction" and "upload" stages itself
+        redaction_result = redact_pdf(pdf.doc, redaction_spans)
         
         print("[PDF Pipeline] Complete!")
         
@@ -86,10 +139,99 @@ def process_pdf_resume(file_bytes: bytes) -> ApiResponse:
             data=None,
             message=str(e),
         )
-    
+
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+# =============================================================================
+# Batch Pipeline
+# =============================================================================
+
+def _error_response(e: Exception) -> ApiResponse:
+    return ApiResponse(status="error", data=None, message=str(e))
+
+
+def process_pdf_batch(pdf_paths: List[str], layout: Optional[str] = None) -> List[ApiResponse]:
+    """
+    Process several PDFs (already on disk) together. Each is read and opened
+    once, in memory, for all of its stages.
+
+    Layout parsing, face detection and redaction run per document, while
+    section classification (NER + BERT), person detection and resume
+    building (GLiNER) are batched across all documents so each model runs
+    once per stage for the whole batch.
+    One failing document does not fail the others.
+    """
+    results: List[Optional[ApiResponse]] = [None] * len(pdf_paths)
+    pdfs: Dict[int, PdfDocument] = {}
+
+    try:
+        print(f"[PDF Batch] Stage 1: Layout processing for {len(pdf_paths)} documents...")
+        documents: List[List[TextGroup]] = []
+        active: List[int] = []
+
+        for i, pdf_path in enumerate(pdf_paths):
+            try:
+                pdfs[i] = PdfDocument.from_path(pdf_path)
+                text_spans = load_text_spans(pdfs[i], layout, "pdf_batch")
+                with stage("pdf_batch", "grouping"):
+                    documents.append(group_spans_by_heading(text_spans))
+                active.append(i)
+
+            except Exception as e:
+                logger.error(f"[PDF Batch] Layout failed for document {i}: {e}")
+                results[i] = _error_response(e)
+
+        print("[PDF Batch] Stage 2: Batched section classification...")
+        with stage("pdf_batch", "classification"):
+            documents = classify_text_groups_batch(documents)
+            documents = [merge_text_groups(remove_common_span_label(groups)) for groups in documents]
+
+        print("[PDF Batch] Stage 3a: Batched person detection...")
+        with stage("pdf_batch", "person_detection"):
+            redaction_batches = detect_person_spans_batch(documents)
+
+        print("[PDF Batch] Stage 3b: Batched resume building...")
+        with stage("pdf_batch", "ner"):
+            resume_batches = build_resume_data_batch(documents, redaction_batches)
+
+        print("[PDF Batch] Stage 3c: Redaction per document...")
+        for i, redaction_spans, resume_data in zip(active, redaction_batches, resume_batches):
+            try:
+                if isinstance(resume_data, Exception):
+                    raise resume_data
+
+                pdf = pdfs[i]
+                with stage("pdf_batch", "face_detection"):
+                    redaction_spans.extend(detect_face_regions(pdf.doc))
+                redaction_result = redact_pdf(pdf.doc, redaction_spans, pipeline="pdf_batch")
+
+                results[i] = ApiResponse(
+                    status="success",
+                    data=resume_data,
+                    message=None,
+                    redacted_file_url=redaction_result.get("redacted_file_url") if redaction_result.get("status") == "success" else None,
+                )
+
+            except Exception as e:
+                logger.error(f"[PDF Batch] Document {i} failed: {e}")
+                results[i] = _error_response(e)
+
+        print("[PDF Batch] Complete!")
+
+    except Exception as e:
+        # A batched model stage failed, so every unfinished document reports it
+        logger.error(f"Error in process_pdf_batch: {str(e)}")
+        logger.error(traceback.format_exc())
+
+        for i in range(len(pdf_paths)):
+            if results[i] is None:
+                results[i] = _error_response(e)
+
     finally:
-        # Cleanup
-        try:
-            pdf_path.unlink(missing_ok=True)
-        except Exception:
-            pass
+        for pdf in pdfs.values():
+            pdf.close()
+
+    return results
@@ -1,13 +1,17 @@
 import re
-from pathlib import Path
-from typing import Any, Dict, List
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import fitz  # PyMuPDF
 import numpy as np
 
+from api.metrics import stage
+from api.settings import PDF_PAGE_THREADS
 from api.pdf.config import EMAIL_RE, PHONE_RES
-from api.pdf.entity_extraction import load_ner_model
+from api.pdf.entity_extraction import predict_entities_batch
 from api.types.types import TextGroup, TextSpan
 from api.supabase_client import upload_redacted_resume_to_storage
 
@@ -62,106 +66,168 @@ def is_valid_person(text: str) -> bool:
 # Person Detection
 # =============================================================================
 
-def detect_person_spans(groups: List[TextGroup]) -> List[TextSpan]:
-    # 1. Collect ALL groups that match "contact" or "summary"
-    contact_groups = [group for group in groups if group.heading in ["contact", "NO_HEADING"]]
-    
-    spans_need_redaction = []
+PERSON_NER_LABELS: List[str] = ["location", "person name", "designation"]
 
-    ner_model = load_ner_model()
 
-    # 2. Iterate through every matching group
-    for group in contact_groups:
-        person_spans = group.spans
-        spans_needing_ner = []
+def detect_person_spans(groups: List[TextGroup]) -> List[TextSpan]:
+    return detect_person_spans_batch([groups])[0]
+
+
+def detect_person_spans_batch(documents: List[List[TextGroup]]) -> List[List[TextSpan]]:
+    """
+    Detect redaction spans for several documents. Spans that need NER are
+    collected across all documents and sent through one batched GLiNER call.
+    """
+    # Per document: (span, needs_ner) in reading order
+    ordered_per_doc: List[List[Tuple[TextSpan, bool]]] = []
+    spans_needing_ner: List[TextSpan] = []
+
+    for groups in documents:
+        # 1. Collect ALL groups that match "contact" or "summary"
+        contact_groups = [group for group in groups if group.heading in ["contact", "NO_HEADING"]]
+        ordered: List[Tuple[TextSpan, bool]] = []
+
+        # 2. Iterate through every matching group
+        for group in contact_groups:
+            # --- Regex Pass ---
+            for span in group.spans:
+                if is_email(span.text):
+                    span.label = "email"
+                    ordered.append((span, False))
+                    continue
+                
+                if is_phone(span.text):
+                    span.label = "phone number"
+                    ordered.append((span, False))
+                    continue
 
-        # --- Regex Pass ---
-        for span in person_spans:
-            if is_email(span.text):
-                span.label = "email"
-                spans_need_redaction.append(span)
+                # come from resolve_heading_via_ner at section classification step
+                if span.label == "person name" and is_valid_person(span.text):
+                    ordered.append((span, False))
+                    continue
+                
+                ordered.append((span, True))
+                spans_needing_ner.append(span)
+
+        # 3. Contact details on later pages outside the contact groups (e.g. a
+        # running header the layout did not recognise as one); regex pass only
+        contact_ids = {id(group) for group in contact_groups}
+        for group in groups:
+            if id(group) in contact_ids:
                 continue
-            
-            if is_phone(span.text):
-                span.label = "phone number"
-                spans_need_redaction.append(span)
+            for span in group.spans:
+                if span.page == 0:
+                    continue
+                if is_email(span.text):
+                    span.label = "email"
+                    ordered.append((span, False))
+                elif is_phone(span.text):
+                    span.label = "phone number"
+                    ordered.append((span, False))
+
+        ordered_per_doc.append(ordered)
+
+    # --- NER Pass (batched) ---
+    ner_results = predict_entities_batch([span.text for span in spans_needing_ner], PERSON_NER_LABELS)
+
+    ner_accepted = set()
+    for span, entities in zip(spans_needing_ner, ner_results):
+        # Determine redaction logic based on the top entity found
+        if entities:
+            top_entity = entities[0]
+            if top_entity['label'] == "person name" and not is_valid_person(top_entity['text']):
                 continue
-
-            # come from resolve_heading_via_ner at section classification step
-            if span.label == "person name" and is_valid_person(span.text):
-                spans_need_redaction.append(span)
+            # If the top entity is a designation
+            if top_entity['label'] == "designation": 
                 continue
-            
-            spans_needing_ner.append(span)
+            span.label = top_entity['label']
+            ner_accepted.add(id(span))
 
-        # --- NER Pass ---
-        for span in spans_needing_ner:
-            entities = ner_model.predict_entities(span.text, ["location", "person name", "designation"])
-            
-            # Determine redaction logic based on the top entity found
-            if entities:
-                top_entity = entities[0]
-                if top_entity['label'] == "person name" and not is_valid_person(top_entity['text']):
-                    continue
-                # If the top entity is a designation
-                if top_entity['label'] == "designation": 
-                    continue
-                span.label = top_entity['label']
-                spans_need_redaction.append(span)
-
-    return spans_need_redaction
+    return [
+        [span for span, needs_ner in ordered if not needs_ner or id(span) in ner_accepted]
+        for ordered in ordered_per_doc
+    ]
 
 
 # =============================================================================
 # Face Detection
 # =============================================================================
 
-def detect_face_regions(pdf_path: str) -> List[TextSpan]:
+_cascades = threading.local()
+_page_pool: Optional[ThreadPoolExecutor] = None
+_page_pool_lock = threading.Lock()
 
-    pdf_doc = fitz.open(str(pdf_path))
-    try:
+
+def get_page_pool() -> ThreadPoolExecutor:
+    """Threads for per-page work of this process, created on first use."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ThreadPoolExecutor(max_workers=PDF_PAGE_THREADS, thread_name_prefix="pdf-page")
+        return _page_pool
+
+
+def get_face_cascade() -> "cv2.CascadeClassifier":
+    # A classifier must not be shared between threads, so each pool thread loads its own
+    cascade = getattr(_cascades, "face", None)
+    if cascade is None:
         cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
-        face_cascade = cv2.CascadeClassifier(cascade_path)
-        
+        cascade = _cascades.face = cv2.CascadeClassifier(cascade_path)
+    return cascade
+
+
+def render_gray(page: fitz.Page) -> np.ndarray:
+    pix = page.get_pixmap()
+
+    # Convert pixmap to numpy array
+    img = np.frombuffer(pix.samples, dtype=np.uint8)
+    img = img.reshape(pix.height, pix.width, pix.n)
+
+    if pix.n == 4:
+        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def detect_faces(gray: np.ndarray):
+    return get_face_cascade().detectMultiScale(
+        gray,
+        scaleFactor=1.1,
+        minNeighbors=5,
+        minSize=(40, 40),
+    )
+
+
+def detect_face_regions(pdf_doc: fitz.Document) -> List[TextSpan]:
+    """
+    Face regions on every page. PyMuPDF is not thread-safe, so pages are
+    rendered one after another; the OpenCV detection (which releases the
+    GIL) runs on the page pool, all pages in parallel.
+    """
+    try:
+        pages = [(page_index, page.rect, render_gray(page)) for page_index, page in enumerate(pdf_doc)]
+        detections = get_page_pool().map(detect_faces, [gray for _, _, gray in pages])
+
         regions = []
-        
-        page = pdf_doc[0]
-        pix = page.get_pixmap()
-        
-        # Convert pixmap to numpy array
-        img = np.frombuffer(pix.samples, dtype=np.uint8)
-        img = img.reshape(pix.height, pix.width, pix.n)
-        
-        if pix.n == 4:
-            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Detect faces
-        faces = face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(40, 40),
-        )
-        
-        # Convert pixel coordinates to PDF coordinates
-        page_rect = page.rect
-        img_h, img_w = gray.shape[:2]
-        scale_x = page_rect.width / img_w
-        scale_y = page_rect.height / img_h
-        
-        for (x, y, w, h) in faces:
-            x0 = page_rect.x0 + x * scale_x
-            y0 = page_rect.y0 + y * scale_y
-            x1 = page_rect.x0 + (x + w) * scale_x
-            y1 = page_rect.y0 + (y + h) * scale_y
-            regions.append(TextSpan(
-                text="face",
-                label="face",
-                bbox=(x0, y0, x1, y1)
-            ))
-        
+
+        for (page_index, page_rect, gray), faces in zip(pages, detections):
+            # Convert pixel coordinates to PDF coordinates
+            img_h, img_w = gray.shape[:2]
+            scale_x = page_rect.width / img_w
+            scale_y = page_rect.height / img_h
+
+            for (x, y, w, h) in faces:
+                x0 = page_rect.x0 + x * scale_x
+                y0 = page_rect.y0 + y * scale_y
+                x1 = page_rect.x0 + (x + w) * scale_x
+                y1 = page_rect.y0 + (y + h) * scale_y
+                regions.append(TextSpan(
+                    text="face",
+                    label="face",
+                    bbox=(x0, y0, x1, y1),
+                    page=page_index,
+                ))
+
         return regions
 
     except Exception as e:
@@ -172,9 +238,6 @@ def detect_face_regions(pdf_path: str) -> List[TextSpan]:
         logger.error(traceback.format_exc())
         
         return []
-    
-    finally:
-        pdf_doc.close()
 
 
 # =============================================================================
@@ -206,14 +269,22 @@ def remove_face_image(target_bbox: tuple, page: fitz.Page):
 # =============================================================================
 
 def redact_spans(spans: List[TextSpan], pdf_doc: fitz.Document) -> fitz.Document:
-    page = pdf_doc[0]
+    spans_by_page: Dict[int, List[TextSpan]] = defaultdict(list)
     for span in spans:
-        if span.label == "face":
-            remove_face_image(span.bbox, page)
-        elif span.bbox:
-            page.add_redact_annot(span.bbox, fill=(0, 0, 0))
+        spans_by_page[span.page].append(span)
+
+    for page_index, page_spans in spans_by_page.items():
+        if not 0 <= page_index < pdf_doc.page_count:
+            continue
+        page = pdf_doc[page_index]
+        for span in page_spans:
+            if span.label == "face":
+                remove_face_image(span.bbox, page)
+            elif span.bbox:
+                page.add_redact_annot(span.bbox, fill=(0, 0, 0))
+
+        page.apply_redactions()
 
-    page.apply_redactions()
     return pdf_doc
 
 
@@ -221,28 +292,25 @@ def redact_spans(spans: List[TextSpan], pdf_doc: fitz.Document) -> fitz.Document
 # Main Redaction Function
 # =============================================================================
 
-def redact_pdf(pdf_path: str, redacted_spans: List[TextSpan]) -> Dict[str, Any]:
-    out_path = None
+def redact_pdf(pdf_doc: fitz.Document, redacted_spans: List[TextSpan], pipeline: str = "pdf") -> Dict[str, Any]:
+    """Redact the request's open document in place and upload it, serialized straight from memory."""
     try:
-        pdf_doc = fitz.open(pdf_path)
-        redacted_doc = redact_spans(redacted_spans, pdf_doc)
-
-        redacted_doc.set_metadata({
-            "title": "redacted-resume.pdf",
-            "author": "",
-            "subject": "Redacted Resume",
-            "creator": "",
-            "producer": "",
-        })
-
-        # Save redacted PDF
-        pdf_path_obj = Path(pdf_path)
-        out_path = pdf_path_obj.with_name(pdf_path_obj.stem + "_redacted.pdf")
-        redacted_doc.save(str(out_path))
-        redacted_doc.close()
-        
-        redacted_bytes = out_path.read_bytes()
-        upload_result = upload_redacted_resume_to_storage(file_bytes=redacted_bytes, file_type="pdf")
+        with stage(pipeline, "redaction"):
+            redacted_doc = redact_spans(redacted_spans, pdf_doc)
+
+            redacted_doc.set_metadata({
+                "title": "redacted-resume.pdf",
+                "author": "",
+                "subject": "Redacted Resume",
+                "creator": "",
+                "producer": "",
+            })
+
+            # Serialize the redacted PDF without a temp file
+            redacted_bytes = redacted_doc.tobytes()
+
+        with stage(pipeline, "upload"):
+            upload_result = upload_redacted_resume_to_storage(file_bytes=redacted_bytes, file_type="pdf")
 
         if upload_result.get("status") == "success":
             redacted_file_url = upload_result.get("signed_url")
@@ -270,16 +338,3 @@ def redact_pdf(pdf_path: str, redacted_spans: List[TextSpan]) -> Dict[str, Any]:
             "redacted_file_url": None,
             "message": str(e),
         }
-    
-    finally:
-        # Cleanup temp files
-        try:
-            pdf_path.unlink(missing_ok=True)
-        except Exception:
-            pass
-        
-        if out_path is not None:
-            try:
-                out_path.unlink(missing_ok=True)
-            except Exception:
-                pass
@@ -0,0 +1,96 @@
+"""
+End-to-end redaction check on a generated two-page resume whose name is
+the page 1 title and repeats as a running header on page 2.
+
+    python -m api.pdf.redaction_check [--layout pymupdf|docling]
+
+Runs layout, section classification and person detection for each layout
+backend (both by default), redacts in memory (no upload) and exits
+non-zero when the name, email or phone number is still readable on any page.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+
+from api.pdf.document import PdfDocument
+from api.pdf.layout_parser import group_spans_by_heading
+from api.pdf.pipeline import load_text_spans
+from api.pdf.redaction import detect_person_spans, redact_spans
+from api.pdf.section_classifier import classify_text_groups, merge_text_groups, remove_common_span_label
+
+NAME = "Jane Doe"
+EMAIL = "jane.doe@example.com"
+PHONE = "+60 12-345 6789"
+
+EXPERIENCE_LINES = [
+    "Built payment services in Go and Python for regional banks and e-wallets.",
+    "Led the migration of a monolith to microservices, cutting latency by forty percent.",
+    "Mentored four junior engineers and ran weekly architecture reviews.",
+]
+
+
+def make_two_page_resume() -> bytes:
+    doc = fitz.open()
+
+    first = doc.new_page()
+    first.insert_text((72, 60), NAME, fontsize=20)
+    first.insert_text((72, 90), f"{EMAIL} | {PHONE}", fontsize=10)
+    first.insert_text((72, 130), "EXPERIENCE", fontsize=12, fontname="hebo")
+    y = 150
+    for i in range(12):
+        first.insert_text((72, y), EXPERIENCE_LINES[i % 3], fontsize=10)
+        y += 14
+    first.insert_text((280, 780), "Page 1 of 2", fontsize=8)
+
+    second = doc.new_page()
+    second.insert_text((72, 40), NAME, fontsize=8)
+    y = 100
+    for i in range(6):
+        second.insert_text((72, y), EXPERIENCE_LINES[i % 3], fontsize=10)
+        y += 14
+    second.insert_text((72, y + 20), "EDUCATION", fontsize=12, fontname="hebo")
+    second.insert_text((72, y + 40), "Bachelor of Computer Science, Universiti Malaya, 2018", fontsize=10)
+    second.insert_text((280, 780), "Page 2 of 2", fontsize=8)
+
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def leaks_after_redaction(data: bytes, layout: str) -> List[str]:
+    """Personal details still readable per page after running the pipeline stages on ``data``."""
+    with PdfDocument(data) as pdf:
+        groups = group_spans_by_heading(load_text_spans(pdf, layout, pipeline="check"))
+        groups = merge_text_groups(remove_common_span_label(classify_text_groups(groups)))
+        redact_spans(detect_person_spans(groups), pdf.doc)
+
+        leaks = []
+        for page_index, page in enumerate(pdf.doc):
+            text = page.get_text()
+            leaks.extend(
+                f"page {page_index + 1}: {value!r}"
+                for value in (NAME, EMAIL, PHONE)
+                if value in text
+            )
+        return leaks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Two-page redaction check")
+    parser.add_argument("--layout", choices=["pymupdf", "docling"], help="one backend only (default: both)")
+    args = parser.parse_args(argv)
+
+    data = make_two_page_resume()
+    failed = False
+    for layout in [args.layout] if args.layout else ["pymupdf", "docling"]:
+        leaks = leaks_after_redaction(data, layout)
+        print(f"{layout}: {'ok' if not leaks else 'NOT REDACTED ' + ', '.join(leaks)}")
+        failed = failed or bool(leaks)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,14 @@
 import logging
-from typing import List
+from typing import List, Union
 
 logger = logging.getLogger(__name__)
 
+from api import progress
 from api.types.types import TextGroup, TextSpan, CandidateOut, ResumeData
-from api.pdf.entity_extraction import build_other, build_skills, build_educations, build_experiences, build_certifications, build_activities
+from api.pdf.entity_extraction import (
+    NerBuilder, build_other, build_skills, build_educations, build_experiences,
+    build_certifications, build_activities, merge_other, run_ner_builders,
+)
 
 
 # =============================================================================
@@ -36,27 +40,85 @@ def build_candidate(redaction_spans: List[TextSpan]) -> CandidateOut:
 # Main Resume Building Function
 # =============================================================================
 
-def build_resume_data(groups: List[TextGroup], person_spans: List[TextSpan]) -> ResumeData:
+# Section builders per document, in the order their sections are streamed
+SECTION_BUILDERS = [
+    ("skills", build_skills),
+    ("education", build_educations),
+    ("experience", build_experiences),
+    ("certifications", build_certifications),
+    ("activities", build_activities),
+    ("other", build_other),
+]
+
+
+def _isolated(builder: NerBuilder) -> NerBuilder:
+    """Return a builder's error instead of raising it, so one document cannot fail the batch."""
+    try:
+        return (yield from builder)
+    except Exception as e:
+        return e
+
+
+def build_resume_data_batch(
+    documents: List[List[TextGroup]],
+    person_spans: List[List[TextSpan]],
+) -> List[Union[ResumeData, Exception]]:
+    """
+    Build the resume data of several documents together: the GLiNER calls of
+    every section of every document run as one batch per label set. Returns
+    one ResumeData per document, or the exception that document raised.
+    """
+    logger.info(f"Building structured resume data for {len(documents)} documents...")
+
+    builders = [
+        _isolated(builder(groups))
+        for groups in documents
+        for _, builder in SECTION_BUILDERS
+    ]
+
+    def section_done(index: int, section):
+        # Each section is streamed as soon as it exists (no-op unless the run is streamed)
+        name = SECTION_BUILDERS[index % len(SECTION_BUILDERS)][0]
+        if name != "other" and not isinstance(section, Exception):
+            progress.emit(name, section)
+
+    # Candidates need no model, so they go out before the first GLiNER batch
+    candidates = [build_candidate(spans) for spans in person_spans]
+    for candidate in candidates:
+        progress.emit("candidate", candidate)
 
-    logger.info("Building structured resume data...")
-    
-    candidate = build_candidate(person_spans)
-    skills = build_skills(groups)
-    educations = build_educations(groups)
-    experiences = build_experiences(groups)
-    certifications = build_certifications(groups)
-    activities = build_activities(groups)
-
-    resume_data = ResumeData(
-        candidate=candidate,
-        education=educations,
-        experience=experiences,
-        skills=skills,
-        certifications=certifications,
-        activities=activities
-    )
-
-    # NER for "other" sections at the end
-    resume_data = build_other(groups, resume_data)
-    
+    sections = run_ner_builders(builders, on_done=section_done)
+
+    results: List[Union[ResumeData, Exception]] = []
+    for doc_index, candidate in enumerate(candidates):
+        start = doc_index * len(SECTION_BUILDERS)
+        skills, educations, experiences, certifications, activities, other = sections[start:start + len(SECTION_BUILDERS)]
+
+        error = next((section for section in (skills, educations, experiences, certifications, activities, other)
+                      if isinstance(section, Exception)), None)
+        if error is not None:
+            results.append(error)
+            continue
+
+        resume_data = ResumeData(
+            candidate=candidate,
+            education=educations,
+            experience=experiences,
+            skills=skills,
+            certifications=certifications,
+            activities=activities
+        )
+
+        # NER for "other" sections at the end
+        resume_data = merge_other(other, resume_data)
+        progress.emit("resume", resume_data)
+        results.append(resume_data)
+
+    return results
+
+
+def build_resume_data(groups: List[TextGroup], person_spans: List[TextSpan]) -> ResumeData:
+    (resume_data,) = build_resume_data_batch([groups], [person_spans])
+    if isinstance(resume_data, Exception):
+        raise resume_data
     return resume_data
@@ -4,10 +4,21 @@ from typing import Dict, List, Optional, Tuple
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
+from api.metrics import count_model_call
 from api.types.types import TextGroup
-from api.pdf.config import COMMON_SECTION_HEADERS, SECTION_CLASSIFIER_MODEL, SECTION_MERGE_MAP
+from api.pdf.config import (
+    COMMON_SECTION_HEADERS,
+    SECTION_CLASSIFIER_BACKEND,
+    SECTION_CLASSIFIER_BACKENDS,
+    SECTION_CLASSIFIER_BATCH_SIZE,
+    SECTION_CLASSIFIER_MAX_TOKENS,
+    SECTION_CLASSIFIER_MODEL,
+    SECTION_EXCLUDED_LABELS,
+    SECTION_MERGE_MAP,
+)
 from api.pdf.redaction import is_email, is_phone
-from api.pdf.entity_extraction import load_ner_model
+from api.pdf.entity_extraction import load_ner_model, predict_entities_batch
+from api.pdf.section_onnx import load_onnx_classifier
 
 
 # =============================================================================
@@ -18,16 +29,30 @@ _MODEL = None
 _TOKENIZER = None
 
 
+def load_section_classifier_backend(backend: str):
+    """Load the section classifier with the given backend ("torch" or "onnx"), uncached."""
+    if backend not in SECTION_CLASSIFIER_BACKENDS:
+        raise ValueError(f"Unknown section classifier backend: {backend}")
+
+    print(f"[SectionClassifier] Loading BERT model ({backend}): {SECTION_CLASSIFIER_MODEL}...")
+    tokenizer = AutoTokenizer.from_pretrained(SECTION_CLASSIFIER_MODEL)
+
+    if backend == "onnx":
+        model = load_onnx_classifier(SECTION_CLASSIFIER_MODEL, tokenizer)
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(SECTION_CLASSIFIER_MODEL)
+        model.eval()
+
+    print("[SectionClassifier] BERT model loaded successfully.")
+    return model, tokenizer
+
+
 def load_section_classifier() -> Tuple[AutoModelForSequenceClassification, AutoTokenizer]:
     global _MODEL, _TOKENIZER
-    
+
     if _MODEL is None or _TOKENIZER is None:
-        print(f"[SectionClassifier] Loading BERT model: {SECTION_CLASSIFIER_MODEL}...")
-        _TOKENIZER = AutoTokenizer.from_pretrained(SECTION_CLASSIFIER_MODEL)
-        _MODEL = AutoModelForSequenceClassification.from_pretrained(SECTION_CLASSIFIER_MODEL)
-        _MODEL.eval()
-        print("[SectionClassifier] BERT model loaded successfully.")
-    
+        _MODEL, _TOKENIZER = load_section_classifier_backend(SECTION_CLASSIFIER_BACKEND)
+
     return _MODEL, _TOKENIZER
 
 
@@ -120,14 +145,17 @@ def process_no_heading(group: TextGroup) -> Optional[TextGroup]:
 # NER to heading for section classification
 # =============================================================================
 
+HEADING_NER_LABELS: List[str] = ["person name", "university", "company", "job title", "academic degree", "skill"]
+
+
 def resolve_heading_via_ner(group: TextGroup) -> bool:
     # Run NER on the heading text
     ner_model = load_ner_model()
-    entities = ner_model.predict_entities(
-        group.heading, 
-        ["person name", "university", "company", "job title", "academic degree", "skill"]
-    )
-    
+    entities = ner_model.predict_entities(group.heading, HEADING_NER_LABELS)
+    return resolve_heading_from_entities(group, entities)
+
+
+def resolve_heading_from_entities(group: TextGroup, entities: List[dict]) -> bool:
     # Check entities to determine section
     for entity in entities:
         label = entity['label']
@@ -167,88 +195,145 @@ def resolve_heading_via_ner(group: TextGroup) -> bool:
 # BERT Classification
 # =============================================================================
 
-def classify_text(model, tokenizer, text: str) -> Optional[str]:
-    if not text or not text.strip():
-        return None
+def _excluded_label_mask(model) -> torch.Tensor:
+    # True for every class the classifier must never return
+    id2label = model.config.id2label
+    return torch.tensor([
+        id2label.get(class_idx, "other").lower() in SECTION_EXCLUDED_LABELS
+        for class_idx in range(model.config.num_labels)
+    ])
+
+
+def classify_texts(model, tokenizer, texts: List[str]) -> List[Optional[str]]:
+    """
+    Classify many texts with as few padded forward passes as possible.
+
+    Texts are sorted by token length and padded only to the longest text of
+    their batch; excluded labels are masked out of the logits before argmax.
+    """
+    results: List[Optional[str]] = [None] * len(texts)
+    indices = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not indices:
+        return results
 
     try:
-        inputs = tokenizer(text.strip(), return_tensors="pt", truncation=True, max_length=512)
-        
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            # Sort class indices by logits (descending)
-            sorted_indices = torch.argsort(logits, dim=-1, descending=True).squeeze().tolist()
-        
-        # Find the best label that is not excluded
-        for class_idx in sorted_indices:
-            label = model.config.id2label.get(class_idx, "other").lower()
-            if label not in {"para"}:
-                return label
-        
-        return "other"
-        
+        encodings = tokenizer(
+            [texts[i].strip() for i in indices],
+            truncation=True,
+            max_length=SECTION_CLASSIFIER_MAX_TOKENS,
+        )
+        features = [
+            {key: values[position] for key, values in encodings.items()}
+            for position in range(len(indices))
+        ]
+        by_length = sorted(range(len(indices)), key=lambda position: len(features[position]["input_ids"]))
+        excluded = _excluded_label_mask(model)
+
+        for start in range(0, len(by_length), SECTION_CLASSIFIER_BATCH_SIZE):
+            batch = by_length[start:start + SECTION_CLASSIFIER_BATCH_SIZE]
+            inputs = tokenizer.pad([features[position] for position in batch], return_tensors="pt")
+
+            with torch.no_grad():
+                count_model_call("section_bert")
+                logits = model(**inputs).logits
+                # Best allowed class per row
+                best = logits.masked_fill(excluded, float("-inf")).argmax(dim=-1).tolist()
+
+            for position, class_idx in zip(batch, best):
+                results[indices[position]] = model.config.id2label.get(class_idx, "other").lower()
+
     except Exception as e:
-        print(f"[SectionClassifier] Error classifying: {e}")
-        return None
+        print(f"[SectionClassifier] Error classifying batch: {e}")
+
+    return results
+
+
+def classify_text(model, tokenizer, text: str) -> Optional[str]:
+    return classify_texts(model, tokenizer, [text])[0]
+
+
+def build_classification_text(group: TextGroup) -> str:
+    # Use context from the body text to help classification.
+    classification_text = group.heading
+    if group.text:
+        classification_text = f"{classification_text} {group.text[:300]}".strip()
+    return classification_text
+
     
 # =============================================================================
 # Main Classification function
 # =============================================================================
 
 def classify_text_groups(groups: List[TextGroup]) -> List[TextGroup]:
-    final_groups: List[TextGroup] = []
+    return classify_text_groups_batch([groups])[0]
+
+
+def classify_text_groups_batch(documents: List[List[TextGroup]]) -> List[List[TextGroup]]:
+    """
+    Classify the groups of several documents at once.
+
+    The cheap steps run per group; every heading that reaches NER goes through
+    one batched GLiNER call, and every group that still needs BERT goes through
+    one batched forward pass. Group order within each document is preserved.
+    """
     model, tokenizer = load_section_classifier()
 
-    for group in groups:
-        # -----------------------------------------------------------
-        # Step 1: Handle 'NO_HEADING' Special Case
-        # -----------------------------------------------------------
-        if group.heading == "NO_HEADING":
-            group = process_no_heading(group)
-            if group: 
-                final_groups.append(group)
-            continue 
-
-        # We will modify 'group' in place and add to final list at the end
-        
-        # -----------------------------------------------------------
-        # Step 2: Fast-Path (Dictionary Match)
-        # -----------------------------------------------------------
-        # Fastest check. O(1) lookup.
-        matched_section = match_common_header(group.heading)
-        if matched_section:
-            group.heading = matched_section
-            final_groups.append(group)
-            continue
-
-        # -----------------------------------------------------------
-        # Step 3: NER Resolution (Heuristic)
-        # -----------------------------------------------------------
-        # Slower than dict, faster than BERT. Good for "University of X".
-        if resolve_heading_via_ner(group):
-            # If function returns True, group.heading is already updated
+    final_documents: List[List[TextGroup]] = []
+    ner_pending: List[TextGroup] = []
+
+    for groups in documents:
+        final_groups: List[TextGroup] = []
+
+        for group in groups:
+            # -----------------------------------------------------------
+            # Step 1: Handle 'NO_HEADING' Special Case
+            # -----------------------------------------------------------
+            if group.heading == "NO_HEADING":
+                group = process_no_heading(group)
+                if group: 
+                    final_groups.append(group)
+                continue 
+
+            # We will modify 'group' in place, so it keeps its position in the list
             final_groups.append(group)
-            continue
 
-        # -----------------------------------------------------------
-        # Step 4: BERT Classification (Deep Learning Fallback)
-        # -----------------------------------------------------------
-        # Slowest. Use context from the body text to help classification.
-        classification_text = group.heading
-        if group.text:
-            classification_text = f"{classification_text} {group.text[:300]}".strip()
-        
-        section_type = classify_text(model, tokenizer, classification_text)
-        
+            # -----------------------------------------------------------
+            # Step 2: Fast-Path (Dictionary Match)
+            # -----------------------------------------------------------
+            # Fastest check. O(1) lookup.
+            matched_section = match_common_header(group.heading)
+            if matched_section:
+                group.heading = matched_section
+                continue
+
+            ner_pending.append(group)
+
+        final_documents.append(final_groups)
+
+    # -----------------------------------------------------------
+    # Step 3: NER Resolution (Heuristic)
+    # -----------------------------------------------------------
+    # Slower than dict, faster than BERT. Good for "University of X".
+    ner_results = predict_entities_batch([group.heading for group in ner_pending], HEADING_NER_LABELS)
+
+    bert_pending: List[TextGroup] = []
+    for group, entities in zip(ner_pending, ner_results):
+        # If function returns True, group.heading is already updated
+        if not resolve_heading_from_entities(group, entities):
+            bert_pending.append(group)
+
+    # -----------------------------------------------------------
+    # Step 4: BERT Classification (Deep Learning Fallback)
+    # -----------------------------------------------------------
+    # Slowest. Every unresolved group in length-sorted, dynamically padded batches.
+    section_types = classify_texts(model, tokenizer, [build_classification_text(g) for g in bert_pending])
+
+    for group, section_type in zip(bert_pending, section_types):
         if section_type:
-             # Normalize the BERT output using your mapping
-             final_heading = SECTION_MERGE_MAP.get(section_type, section_type)
-             group.heading = final_heading
-
-        final_groups.append(group)
+            # Normalize the BERT output using your mapping
+            group.heading = SECTION_MERGE_MAP.get(section_type, section_type)
 
-    return final_groups
+    return final_documents
 
 
 # =============================================================================
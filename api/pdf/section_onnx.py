@@ -0,0 +1,98 @@
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+import torch
+
+from api.settings import MODEL_ARTIFACT_DIR
+
+
+# =============================================================================
+# Quantized ONNX Runtime Section Classifier
+# =============================================================================
+#
+# The PyTorch model is exported to ONNX once, quantized to int8 weights
+# (dynamic quantization: activations stay float and are quantized on the fly)
+# and cached on disk. Later processes only open the cached file in an
+# onnxruntime CPU session and never load the PyTorch weights.
+
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+ONNX_OPSET = 14
+
+
+def onnx_model_path(model_name: str) -> str:
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+    return os.path.join(MODEL_ARTIFACT_DIR, f"{safe_name}-int8.onnx")
+
+
+def export_quantized_onnx(model, tokenizer, output_path: str):
+    """Export ``model`` to ONNX, quantize it to int8 and write it to ``output_path``."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    directory = os.path.dirname(output_path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    sample = tokenizer(["Education Bachelor of Science"], return_tensors="pt")
+    input_names = [name for name in ONNX_INPUT_NAMES if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # Temp files in the target directory, so parallel workers never see a partial file
+    fd, fp32_path = tempfile.mkstemp(suffix=".onnx", prefix="export_", dir=directory)
+    os.close(fd)
+    fd, int8_path = tempfile.mkstemp(suffix=".onnx", prefix="quant_", dir=directory)
+    os.close(fd)
+
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+            )
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        os.replace(int8_path, output_path)
+    finally:
+        for path in (fp32_path, int8_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class OnnxSequenceClassifier:
+    """
+    Drop-in for the PyTorch model in classify_texts: takes the tokenizer's
+    tensors and returns an object with ``.logits`` and the model ``config``.
+    """
+
+    def __init__(self, onnx_path: str, config):
+        import onnxruntime as ort
+
+        self.config = config
+        self.session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def __call__(self, **inputs) -> SimpleNamespace:
+        feed = {name: inputs[name].numpy() for name in self.input_names}
+        (logits,) = self.session.run(["logits"], feed)
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def load_onnx_classifier(model_name: str, tokenizer) -> OnnxSequenceClassifier:
+    """The cached quantized model of ``model_name``, exported first if missing."""
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    onnx_path = onnx_model_path(model_name)
+    if not os.path.exists(onnx_path):
+        print(f"[SectionClassifier] Exporting int8 ONNX model to {onnx_path}...")
+        # Plain tuple outputs trace cleanly; logits is the first one
+        model = AutoModelForSequenceClassification.from_pretrained(model_name, return_dict=False)
+        model.eval()
+        export_quantized_onnx(model, tokenizer, onnx_path)
+        del model
+
+    return OnnxSequenceClassifier(onnx_path, AutoConfig.from_pretrained(model_name))
@@ -0,0 +1,88 @@
+"""
+Label agreement between the PyTorch section classifier and the int8 ONNX
+Runtime backend.
+
+    python -m api.pdf.section_parity [--texts sections.txt]
+
+Classifies the built-in resume sections (or one text per line of --texts)
+with both backends, prints every disagreement plus the agreement rate and
+the time per backend, and exits non-zero when agreement is below
+--min-agreement. Run it before setting SECTION_CLASSIFIER_BACKEND = "onnx".
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from api.pdf.section_classifier import classify_texts, load_section_classifier_backend
+
+DEFAULT_MIN_AGREEMENT = 0.95
+
+# Heading plus the start of the body text, as build_classification_text sends them
+SAMPLE_TEXTS: List[str] = [
+    "John Smith john.smith@gmail.com +60 12-345 6789 Kuala Lumpur, Malaysia",
+    "Software Engineer | jane.doe@outlook.com | linkedin.com/in/janedoe",
+    "Profile Results-driven backend engineer with 6 years of experience building payment systems.",
+    "About Me I am a fresh graduate passionate about data analytics and machine learning.",
+    "Work History Senior Data Analyst, Maybank 2019 - 2023 Built dashboards in Power BI for the retail division.",
+    "Employment Software Engineer at Grab (2020-Present) Designed microservices in Go serving 2M requests a day.",
+    "Internship Intern, Petronas Digital Jun 2022 - Aug 2022 Automated report generation with Python.",
+    "Academic Background Bachelor of Computer Science (Hons), Universiti Malaya, CGPA 3.72",
+    "Qualifications Master of Business Administration, Monash University Malaysia 2018",
+    "Schooling SPM 2015, 9A, SMK Seri Bintang Utara",
+    "Technical Stack Python, Django, PostgreSQL, Docker, Kubernetes, AWS, Terraform",
+    "Tools Excel, Tableau, SQL Server, SAP, Jira",
+    "Strengths Communication, teamwork, leadership, problem solving, time management",
+    "Languages English (fluent), Malay (native), Mandarin (conversational)",
+    "Honours Dean's List 2019, 2020; Best Final Year Project Award",
+    "Licenses AWS Certified Solutions Architect - Associate (2022); Google Data Analytics Certificate",
+    "Selected Work Inventory tracker: Flutter app with Firebase backend used by 3 local shops.",
+    "Personal Projects Built a Telegram bot that summarises news articles using GPT.",
+    "Hobbies Badminton, photography, volunteering at animal shelters",
+    "Extracurricular President of the Computer Science Society 2020/2021, organised a 300-person hackathon.",
+    "Reference Available upon request",
+    "Responsible for onboarding new clients and maintaining relationships with key accounts across the region.",
+]
+
+
+def read_texts(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def timed_classify(backend: str, texts: List[str]) -> tuple:
+    model, tokenizer = load_section_classifier_backend(backend)
+    classify_texts(model, tokenizer, texts[:1])  # warm-up
+    start = time.perf_counter()
+    labels = classify_texts(model, tokenizer, texts)
+    return labels, time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Section classifier backend parity")
+    parser.add_argument("--texts", help="file with one text per line (default: built-in samples)")
+    parser.add_argument("--min-agreement", type=float, default=DEFAULT_MIN_AGREEMENT)
+    args = parser.parse_args(argv)
+
+    texts = read_texts(args.texts) if args.texts else SAMPLE_TEXTS
+
+    torch_labels, torch_seconds = timed_classify("torch", texts)
+    onnx_labels, onnx_seconds = timed_classify("onnx", texts)
+
+    disagreements = [
+        (text, expected, actual)
+        for text, expected, actual in zip(texts, torch_labels, onnx_labels)
+        if expected != actual
+    ]
+    for text, expected, actual in disagreements:
+        print(f"torch={expected!r:<28} onnx={actual!r:<28} {text[:60]}")
+
+    agreement = 1.0 - len(disagreements) / len(texts)
+    print(f"texts: {len(texts)}  agreement: {agreement:.3f}  (minimum {args.min_agreement:.3f})")
+    print(f"torch: {torch_seconds * 1000:.1f} ms  onnx: {onnx_seconds * 1000:.1f} ms")
+
+    return 0 if agreement >= args.min_agreement else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
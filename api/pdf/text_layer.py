@@ -0,0 +1,326 @@
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import fitz
+
+from api.pdf.config import (
+    BULLET_GLYPHS,
+    COMMON_SECTION_HEADERS,
+    HEADING_GAP_RATIO,
+    HEADING_MAX_WORDS,
+    HEADING_SIZE_RATIO,
+    MAX_UNMAPPED_CHAR_RATIO,
+    MIN_TEXT_LAYER_CHARS,
+    MULTI_COLUMN_TEXT_RATIO,
+    RUNNING_MARGIN_RATIO,
+)
+from api.types.types import TextSpan
+
+
+# =============================================================================
+# PyMuPDF Layout Backend
+# =============================================================================
+#
+# Builds the same TextSpans as load_pdf + preprocess_layout_doc (every page,
+# "section_header" / "list_item" / "text" labels, heading per span carried
+# across page breaks, running headers/footers labelled "page_header" /
+# "page_footer" with NO_HEADING, bbox in page coordinates) straight from the PDF text
+# layer, for born-digital resumes exported from Word, LaTeX, etc. Documents
+# without a usable text layer return None so the caller can fall back to docling.
+
+BOLD_FLAG = 1 << 4
+DASH_BULLETS = {"-", "–", "—", "*"}
+UNMAPPED_CHARS = {"�", "\x00"}
+
+
+def header_name(text: str) -> str:
+    """Lowercase alphanumerics with single spaces (as section_classifier.clean_string)."""
+    return " ".join(re.sub(r"[^a-z0-9\s]", "", text.lower()).split())
+
+
+_HEADER_NAMES = {header_name(header) for headers in COMMON_SECTION_HEADERS.values() for header in headers}
+
+Bbox = Tuple[float, float, float, float]
+
+
+@dataclass
+class Line:
+    text: str
+    bbox: Bbox
+    page: int
+    block: int
+    size: float   # dominant font size, weighted by characters
+    bold: bool    # every visible character is bold
+    running: Optional[str] = None  # "page_header" / "page_footer" for running lines
+
+
+# =============================================================================
+# Helper
+# =============================================================================
+
+def union_bbox(a: Bbox, b: Bbox) -> Bbox:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def read_lines(page: fitz.Page, page_index: int = 0) -> List[Line]:
+    """Text lines of a page in reading order, with their font size and weight."""
+    lines: List[Line] = []
+    data = page.get_text("dict", sort=True)
+
+    for block_no, block in enumerate(data["blocks"]):
+        if block.get("type") != 0:
+            continue
+        for raw_line in block["lines"]:
+            text = "".join(span["text"] for span in raw_line["spans"]).strip()
+            if not text:
+                continue
+
+            sizes: Counter = Counter()
+            bold_chars = 0
+            visible_chars = 0
+            for span in raw_line["spans"]:
+                n = len(span["text"].strip())
+                visible_chars += n
+                sizes[round(span["size"], 1)] += n
+                if span["flags"] & BOLD_FLAG or "bold" in span["font"].lower():
+                    bold_chars += n
+
+            lines.append(Line(
+                text=" ".join(text.split()),
+                bbox=tuple(raw_line["bbox"]),
+                page=page_index,
+                block=block_no,
+                size=sizes.most_common(1)[0][0] if sizes else 0.0,
+                bold=visible_chars > 0 and bold_chars == visible_chars,
+            ))
+
+    return lines
+
+
+def body_font_size(lines: List[Line]) -> float:
+    sizes: Counter = Counter()
+    for line in lines:
+        sizes[line.size] += len(line.text)
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+# =============================================================================
+# Text Layer Checks
+# =============================================================================
+
+def has_usable_text(lines: List[Line]) -> bool:
+    """Enough extractable text, and not a broken font encoding."""
+    text = "".join(line.text for line in lines)
+    if len(text) < MIN_TEXT_LAYER_CHARS:
+        return False
+    unmapped = sum(1 for char in text if char in UNMAPPED_CHARS)
+    return unmapped / len(text) <= MAX_UNMAPPED_CHAR_RATIO
+
+
+def is_multi_column(lines: List[Line], page_width: float) -> bool:
+    """
+    True when a real share of the text sits wholly right of the page centre,
+    beside text wholly left of it (sidebars, two-column templates). Short
+    right-aligned dates next to a job title stay well below the threshold.
+    """
+    middle = page_width / 2
+    left = [line for line in lines if line.bbox[2] < middle]
+    right = [line for line in lines if line.bbox[0] > middle]
+
+    beside = sum(
+        len(line.text)
+        for line in right
+        if any(other.bbox[1] < line.bbox[3] and line.bbox[1] < other.bbox[3] for other in left)
+    )
+    total = sum(len(line.text) for line in lines)
+    return total > 0 and beside / total >= MULTI_COLUMN_TEXT_RATIO
+
+
+def running_key(text: str) -> str:
+    """Text of a line with page numbers masked, so "Page 1 of 2" matches "Page 2 of 2"."""
+    return re.sub(r"\d+", "#", header_name(text))
+
+
+def mark_running_lines(pages: List[Tuple[List[Line], float]]):
+    """
+    Label running headers/footers: lines in the top or bottom margin whose
+    text recurs in a margin of another page (as docling's page_header /
+    page_footer). ``pages`` holds (lines, page height) per page.
+    """
+    margin_lines: List[Tuple[Line, str, str]] = []
+    pages_by_key: Dict[str, Set[int]] = defaultdict(set)
+
+    for lines, height in pages:
+        margin = height * RUNNING_MARGIN_RATIO
+        for line in lines:
+            if line.bbox[3] <= margin:
+                label = "page_header"
+            elif line.bbox[1] >= height - margin:
+                label = "page_footer"
+            else:
+                continue
+            key = running_key(line.text)
+            if key:
+                margin_lines.append((line, label, key))
+                pages_by_key[key].add(line.page)
+
+    for line, label, key in margin_lines:
+        # The top of the first page is the resume header (name, contact details)
+        if label == "page_header" and line.page == 0:
+            continue
+        if len(pages_by_key[key]) > 1:
+            line.running = label
+
+
+# =============================================================================
+# Line Classification
+# =============================================================================
+
+def split_bullet(text: str) -> Optional[str]:
+    """The item text when ``text`` starts with a bullet glyph, else None."""
+    glyph = text[0]
+    if glyph not in BULLET_GLYPHS:
+        return None
+    rest = text[1:]
+    if glyph in DASH_BULLETS and not rest[:1].isspace():
+        return None
+    return rest.strip()
+
+
+def is_heading(line: Line, previous: Optional[Line], body_size: float) -> bool:
+    text = line.text
+    words = text.split()
+    if len(words) > HEADING_MAX_WORDS or text[-1] in ".,;" or split_bullet(text) is not None:
+        return False
+
+    if body_size and line.size >= body_size * HEADING_SIZE_RATIO:
+        return True
+
+    letters = [char for char in text if char.isalpha()]
+    all_caps = bool(letters) and all(char.isupper() for char in letters)
+    spaced = (
+        previous is None
+        or previous.page != line.page
+        or line.bbox[1] - previous.bbox[3] >= body_size * HEADING_GAP_RATIO
+    )
+
+    if all_caps and (line.bold or spaced):
+        return True
+
+    # Bold alone also marks job titles and company names; only known section names count
+    return line.bold and spaced and header_name(text) in _HEADER_NAMES
+
+
+# =============================================================================
+# Spans
+# =============================================================================
+
+def build_text_spans(lines: List[Line]) -> List[TextSpan]:
+    """
+    Merge lines into section headers, list items (bullet glyph up to the next
+    bullet, heading or unindented line) and paragraphs (lines of one block
+    without a paragraph gap), and assign each span its heading the way
+    preprocess_layout_doc does.
+    """
+    body_size = body_font_size(lines)
+    paragraph_gap = body_size * HEADING_GAP_RATIO
+
+    spans: List[TextSpan] = []
+    current: Optional[TextSpan] = None
+    previous: Optional[Line] = None
+    pending_bullet = False
+    heading = "NO_HEADING"
+
+    def flush():
+        nonlocal current
+        if current is not None and current.text:
+            spans.append(current)
+        current = None
+
+    for line in lines:
+        if line.running:
+            # Neither part of the section it interrupts nor a heading; the
+            # section goes on after it
+            flush()
+            spans.append(TextSpan(text=line.text, label=line.running, heading="NO_HEADING", bbox=line.bbox, page=line.page))
+            continue
+
+        item_text = split_bullet(line.text)
+
+        if item_text == "":
+            # A bullet glyph on its own line: the item text follows
+            flush()
+            pending_bullet = True
+
+        elif is_heading(line, previous, body_size):
+            flush()
+            heading = line.text
+            spans.append(TextSpan(text=line.text, label="section_header", heading=None, bbox=line.bbox, page=line.page))
+
+        elif item_text is not None or pending_bullet:
+            flush()
+            current = TextSpan(
+                text=item_text if item_text is not None else line.text,
+                label="list_item",
+                heading=heading,
+                bbox=line.bbox,
+                page=line.page,
+            )
+            pending_bullet = False
+
+        else:
+            continues = (
+                current is not None
+                and previous is not None
+                and (previous.page, previous.block) == (line.page, line.block)
+                and line.bbox[1] - previous.bbox[3] < paragraph_gap
+                # A wrapped list item is indented past its bullet
+                and (current.label != "list_item" or line.bbox[0] > current.bbox[0] + 1)
+            )
+            if continues:
+                current.text += " " + line.text
+                current.bbox = union_bbox(current.bbox, line.bbox)
+            else:
+                flush()
+                current = TextSpan(text=line.text, label="text", heading=heading, bbox=line.bbox, page=line.page)
+
+        previous = line
+
+    flush()
+
+    # Like docling, a header is its own heading only when content follows it
+    real_headings = {span.heading for span in spans if span.label != "section_header"}
+    for span in spans:
+        if span.label == "section_header":
+            span.heading = span.text if span.text in real_headings else "NO_HEADING"
+
+    return spans
+
+
+def extract_text_spans(pdf_doc: fitz.Document, require_simple_layout: bool = True) -> Optional[List[TextSpan]]:
+    """
+    TextSpans of every page from the text layer, or None when docling should
+    handle the PDF: no usable text layer, or (with ``require_simple_layout``)
+    a multi-column or scanned page.
+    """
+    lines: List[Line] = []
+    pages: List[Tuple[List[Line], float]] = []
+    for page_index, page in enumerate(pdf_doc):
+        page_lines = read_lines(page, page_index)
+        if require_simple_layout:
+            if is_multi_column(page_lines, page.rect.width):
+                return None
+            if not page_lines and page.get_images():
+                # Image-only page: only docling's OCR can read it
+                return None
+        lines.extend(page_lines)
+        pages.append((page_lines, page.rect.height))
+
+    if not has_usable_text(lines):
+        return None
+
+    mark_running_lines(pages)
+
+    return build_text_spans(lines)
@@ -0,0 +1,159 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Tuple
+
+from api.settings import ENABLED_PIPELINES
+
+logger = logging.getLogger("api.preload")
+
+
+# =============================================================================
+# Model Warmers (load + one dummy inference each)
+# =============================================================================
+
+def _warm_layout_parser():
+    import fitz  # PyMuPDF
+    from api.pdf.layout_parser import load_pdf
+
+    # docling needs a real PDF, so render a one-line document
+    pdf_doc = fitz.open()
+    page = pdf_doc.new_page()
+    page.insert_text((72, 72), "Education")
+    page.insert_text((72, 96), "Bachelor of Science in Computer Science")
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf", prefix="warmup_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_doc.tobytes())
+        load_pdf(tmp_path)
+    finally:
+        pdf_doc.close()
+        os.remove(tmp_path)
+
+
+def _warm_section_classifier():
+    from api.pdf.section_classifier import load_section_classifier, classify_text
+
+    model, tokenizer = load_section_classifier()
+    classify_text(model, tokenizer, "Education Bachelor of Science in Computer Science")
+
+
+def _warm_gliner():
+    from api.pdf.entity_extraction import load_ner_model
+
+    load_ner_model().predict_entities("John Smith, Software Engineer at Google", ["person name", "company"])
+
+
+def _warm_image_classifier():
+    from api.image.classifier import load_text_classifier, classify_text
+
+    classify_text("Education Bachelor of Science", load_text_classifier())
+
+
+def _warm_image_extraction():
+    # Importing the module loads spaCy, SkillNer, the job-title finder and the CoNLL NER
+    from api.image.extraction import extract_conll_entities
+
+    extract_conll_entities("John Smith works at Google in Kuala Lumpur")
+
+
+# (model name, pipeline, warmer)
+MODEL_WARMERS: List[Tuple[str, str, Callable[[], None]]] = [
+    ("layout_parser", "pdf", _warm_layout_parser),
+    ("section_classifier", "pdf", _warm_section_classifier),
+    ("gliner", "pdf", _warm_gliner),
+    ("image_classifier", "image", _warm_image_classifier),
+    ("image_extraction", "image", _warm_image_extraction),
+]
+
+
+def enabled_warmers() -> List[Tuple[str, str, Callable[[], None]]]:
+    return [warmer for warmer in MODEL_WARMERS if warmer[1] in ENABLED_PIPELINES]
+
+
+def warm_models() -> Dict[str, Dict[str, Any]]:
+    """
+    Load every model and run one dummy inference through it.
+
+    Returns per-model state: {"state": "loaded" | "failed", "load_seconds": float, "error": str | None}.
+    Only models of the enabled pipelines are touched. A failing model is
+    reported, not raised, so the others still warm up.
+    """
+    report: Dict[str, Dict[str, Any]] = {}
+
+    for name, pipeline, warmer in enabled_warmers():
+        logger.info(f"[Preload] Warming {name} ({pipeline})...")
+        start = time.perf_counter()
+
+        try:
+            warmer()
+            report[name] = {
+                "state": "loaded",
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "error": None,
+            }
+            logger.info(f"[Preload] {name} ready in {report[name]['load_seconds']}s")
+
+        except Exception as e:
+            report[name] = {
+                "state": "failed",
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "error": str(e),
+            }
+            logger.error(f"[Preload] Failed to warm {name}: {e}")
+            logger.error(traceback.format_exc())
+
+    return report
+
+
+# =============================================================================
+# Readiness Tracking
+# =============================================================================
+
+class Readiness:
+    """
+    Collects warm-up reports from every process that serves resumes
+    (each pool worker, or the API process itself when the pool is disabled).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expected = 1
+        self._reports: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def expect(self, count: int):
+        with self._lock:
+            self._expected = max(count, 1)
+            self._reports = {}
+
+    def record(self, process_id: str, report: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            self._reports[process_id] = report
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            reports = dict(self._reports)
+            expected = self._expected
+
+        all_loaded = all(
+            model["state"] == "loaded"
+            for report in reports.values()
+            for model in report.values()
+        )
+
+        # Pending processes show every model as still loading
+        pending = {name: {"state": "loading", "load_seconds": None, "error": None} for name, _, _ in enabled_warmers()}
+
+        return {
+            "ready": len(reports) >= expected and all_loaded,
+            "processes_expected": expected,
+            "processes_warm": len(reports),
+            "models": reports if reports else {"pending": pending},
+        }
+
+
+readiness = Readiness()
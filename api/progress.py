@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# =============================================================================
+# Progress Events (emitted by the pipelines)
+# =============================================================================
+
+# Set in pool workers so events reach the API process that holds the stream
+_forward: Optional[Callable[[Tuple[Any, ...]], None]] = None
+
+# The stream the current pipeline run reports to (one run per thread)
+_current = threading.local()
+
+# Last message of every run on a stream; never forwarded to the client
+END_EVENT = "end"
+
+# How long a stream waits for END_EVENT once the run's result is in
+END_TIMEOUT_SECONDS = 10.0
+
+
+def forward_to(sink: Optional[Callable[[Tuple[Any, ...]], None]]):
+    global _forward
+    _forward = sink
+
+
+@contextmanager
+def streaming(stream_id: Optional[str]) -> Iterator[None]:
+    """Route every ``emit`` made inside this block to the stream ``stream_id``."""
+    previous = getattr(_current, "stream_id", None)
+    _current.stream_id = stream_id
+    try:
+        yield
+    finally:
+        _current.stream_id = previous
+
+
+def _jsonable(data: Any) -> Any:
+    if hasattr(data, "model_dump"):
+        return data.model_dump(mode="json")
+    if isinstance(data, (list, tuple)):
+        return [_jsonable(item) for item in data]
+    if isinstance(data, dict):
+        return {key: _jsonable(value) for key, value in data.items()}
+    return data
+
+
+def emit(event: str, data: Any = None):
+    """
+    Report a finished stage or a partial result. A no-op unless the
+    current run is being streamed, so the pipelines can call it freely.
+    """
+    stream_id = getattr(_current, "stream_id", None)
+    if stream_id is None:
+        return
+
+    _send(("progress", stream_id, event, _jsonable(data)))
+
+
+def end(stream_id: Optional[str]):
+    """
+    Mark the end of a run's events. Sent on the same channel as the events,
+    after the last one, so a listener that sees it has seen them all.
+    """
+    if stream_id is None:
+        return
+
+    _send(("progress", stream_id, END_EVENT, None))
+
+
+def _send(message: Tuple[Any, ...]):
+    if _forward is not None:
+        try:
+            _forward(message)
+            return
+        except Exception:
+            # Never fail a resume because progress could not be shipped
+            pass
+    dispatch(message)
+
+
+# =============================================================================
+# Listeners (API process)
+# =============================================================================
+
+_listeners: Dict[str, Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Tuple[str, Any]]"]] = {}
+_listeners_lock = threading.Lock()
+
+
+def dispatch(message: Tuple[Any, ...]):
+    """Deliver a ("progress", stream_id, event, data) message to its listener, from any thread."""
+    _, stream_id, event, data = message
+    with _listeners_lock:
+        listener = _listeners.get(stream_id)
+    if listener is None:
+        return
+
+    loop, queue = listener
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+    except RuntimeError:
+        # The loop closed while the run was still reporting
+        pass
+
+
+@contextmanager
+def listen(stream_id: str) -> Iterator["asyncio.Queue[Tuple[str, Any]]"]:
+    """Receive (event, data) pairs for ``stream_id`` on an asyncio queue of the running loop."""
+    queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+    with _listeners_lock:
+        _listeners[stream_id] = (asyncio.get_running_loop(), queue)
+    try:
+        yield queue
+    finally:
+        with _listeners_lock:
+            _listeners.pop(stream_id, None)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
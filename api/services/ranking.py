@@ -1,6 +1,13 @@
+import bisect
+import heapq
 import json
 import re
+from dataclasses import dataclass
 from difflib import SequenceMatcher
+from typing import Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -16,119 +23,265 @@ def normalize(text):
     return text.strip()
 
 
+# -----------------------------------------
+# Ranking profile (normalized once per resume)
+# -----------------------------------------
+PROFILE_VERSION = 1
+
+
+def skill_vocab(skills):
+    return list(dict.fromkeys(normalize(skill) for skill in skills))
+
+
+def experience_vocab(experience_list):
+    # Each distinct word is compared once, however often it repeats
+    combined_desc = " ".join([normalize(e.get("description", "")) for e in experience_list])
+    return list(dict.fromkeys(combined_desc.split()))
+
+
+def degree_strings(education_list):
+    return [normalize(e.get("degree", "")) for e in education_list]
+
+
+def build_ranking_profile(resume):
+    """
+    Everything the matchers need from a parsed resume, already normalized:
+    the skill set, the experience word vocabulary and the degree strings.
+    """
+    return {
+        "version": PROFILE_VERSION,
+        "skills": skill_vocab(resume.get("skills", [])),
+        "experience_tokens": experience_vocab(resume.get("experience", [])),
+        "degrees": degree_strings(resume.get("education", [])),
+    }
+
+
 # -----------------------------------------
 # Fuzzy + substring + exact matching (BEST)
 # -----------------------------------------
-def simple_skill_match(skills, requirement):
-    req = normalize(requirement)
+# Skill and experience similarities use rapidfuzz's C kernels (fuzz.ratio,
+# the Indel ratio, scaled 0-100); ranking_parity.py checks them against difflib.
+FUZZY_SKILL_CUTOFF = 80.0
 
-    best_score = 0.0
 
-    for skill in skills:
-        s = normalize(skill)
+def match_skill_vocab(vocab, req):
+    """``vocab``: normalized, deduplicated skills; ``req``: normalized requirement."""
+    if not vocab:
+        return 0.0
 
-        # EXACT match
-        if s == req:
-            return 1.0
+    # EXACT match
+    if req in vocab:
+        return 1.0
+
+    best_score = 0.0
 
-        # SUBSTRING match (ReactJS contains "react")
-        if req in s:
-            best_score = max(best_score, 0.9)
+    # SUBSTRING match (ReactJS contains "react")
+    if any(req in s for s in vocab):
+        best_score = 0.9
 
-        # FUZZY similarity (Node.js ≈ nodejs)
-        ratio = SequenceMatcher(None, s, req).ratio()
-        if ratio > 0.8:
-            best_score = max(best_score, ratio)
+    # FUZZY similarity (Node.js ≈ nodejs)
+    best = process.extractOne(req, vocab, scorer=fuzz.ratio, score_cutoff=FUZZY_SKILL_CUTOFF)
+    if best is not None and best[1] > FUZZY_SKILL_CUTOFF:
+        best_score = max(best_score, best[1] / 100.0)
 
     return best_score
 
 
+def simple_skill_match(skills, requirement):
+    return match_skill_vocab(skill_vocab(skills), normalize(requirement))
+
+
 # -----------------------------------------
 # Education matching (fuzzy included)
 # -----------------------------------------
-def education_match(education_list, requirement):
-    req = normalize(requirement)
-    combined = " ".join([normalize(e.get("degree", "")) for e in education_list])
+def match_degrees(degrees, req):
+    """``degrees``: normalized degree strings; ``req``: normalized requirement."""
+    combined = " ".join(degrees)
 
     if req in combined:
         return 1.0
 
+    # One comparison per requirement, so this stays on difflib: on whole degree
+    # strings the Indel ratio runs up to ~0.25 above Ratcliff/Obershelp
     ratio = SequenceMatcher(None, combined, req).ratio()
     return ratio
 
 
+def education_match(education_list, requirement):
+    return match_degrees(degree_strings(education_list), normalize(requirement))
+
+
 # -----------------------------------------
 # Experience matching
 # -----------------------------------------
-def experience_match(experience_list, requirement):
-    req_tokens = normalize(requirement).split()
+def match_experience_vocab(vocab, req):
+    """``vocab``: deduplicated experience words; ``req``: normalized requirement."""
+    req_tokens = req.split()
+    return match_experience_tokens(vocab, req_tokens, list(dict.fromkeys(req_tokens)))
 
-    # Combine all experience descriptions into one string
-    combined_desc = " ".join([normalize(e.get("description", "")) for e in experience_list])
-    desc_tokens = combined_desc.split()
 
-    if not req_tokens or not desc_tokens:
+def match_experience_tokens(vocab, req_tokens, req_vocab):
+    """Same as match_experience_vocab, with the requirement already split (and deduplicated)."""
+    if not req_tokens or not vocab:
         return 0.0
 
-    scores = []
+    # Best similarity of every requirement word against all experience words
+    similarity = process.cdist(req_vocab, vocab, scorer=fuzz.ratio, dtype=np.float64)
+    best = dict(zip(req_vocab, similarity.max(axis=1) / 100.0))
+
+    # Mean similarity score (0–1) over the requirement words as written
+    return float(sum(best[word] for word in req_tokens) / len(req_tokens))
+
+
+def experience_match(experience_list, requirement):
+    return match_experience_vocab(experience_vocab(experience_list), normalize(requirement))
+
+# -----------------------------------------
+# Compiled scoring plan (one per job)
+# -----------------------------------------
+@dataclass(frozen=True)
+class ScoringPlan:
+    """
+    A job's requirements, compiled once: normalized texts, experience token
+    sets, per-category weight vectors and category fractions. Immutable, so
+    one plan can be shared by every ranking of the job.
+    """
+    skill_keys: Tuple[str, ...]
+    skill_texts: Tuple[str, ...]
+    skill_weights: Tuple[float, ...]
+    experience_keys: Tuple[str, ...]
+    experience_tokens: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...]  # (as written, deduplicated)
+    experience_weights: Tuple[float, ...]
+    education_keys: Tuple[str, ...]
+    education_texts: Tuple[str, ...]
+    education_weights: Tuple[float, ...]
+    skill_weight: float
+    experience_weight: float
+    education_weight: float
+    cat_skill: float
+    cat_exp: float
+    cat_edu: float
+    text: str  # all requirement texts, for TF-IDF
+
+
+# Bump when a matcher changes, so stored per-requirement scores are recomputed
+SCORE_MATRIX_VERSION = 1
+
+
+def requirement_key(req_type, text):
+    """
+    Identifies one requirement's column in a score matrix. It depends only on
+    what is matched (type + normalized text), so reweighting a requirement
+    keeps its scores and editing its text starts a new column.
+    """
+    return f"{req_type}:{text}"
+
+
+def compile_plan(job_requirements) -> ScoringPlan:
+    texts = {"skill": [], "experience": [], "education": []}
+    weights = {"skill": [], "experience": [], "education": []}
+    all_texts = []
+
+    for req in job_requirements:
+        text = normalize(req["normalized_requirement"] or req["requirement"])
+        all_texts.append(text)
+        if req["type"] in texts:
+            texts[req["type"]].append(text)
+            weights[req["type"]].append(req["weightage"])
+
+    skill_weight = sum(weights["skill"])
+    exp_weight = sum(weights["experience"])
+    edu_weight = sum(weights["education"])
+
+    total_category_weight = skill_weight + exp_weight + edu_weight
+
+    cat_skill = skill_weight / total_category_weight if total_category_weight > 0 else 0
+    cat_exp   = exp_weight   / total_category_weight if total_category_weight > 0 else 0
+    cat_edu   = edu_weight   / total_category_weight if total_category_weight > 0 else 0
 
-    # Compare each requirement word to all experience words
-    for req_word in req_tokens:
-        best = 0.0
-        for exp_word in desc_tokens:
-            ratio = SequenceMatcher(None, req_word, exp_word).ratio()
-            if ratio > best:
-                best = ratio
-        scores.append(best)
+    experience_tokens = []
+    for text in texts["experience"]:
+        tokens = tuple(text.split())
+        experience_tokens.append((tokens, tuple(dict.fromkeys(tokens))))
+
+    return ScoringPlan(
+        skill_keys=tuple(requirement_key("skill", text) for text in texts["skill"]),
+        skill_texts=tuple(texts["skill"]),
+        skill_weights=tuple(weights["skill"]),
+        experience_keys=tuple(requirement_key("experience", text) for text in texts["experience"]),
+        experience_tokens=tuple(experience_tokens),
+        experience_weights=tuple(weights["experience"]),
+        education_keys=tuple(requirement_key("education", text) for text in texts["education"]),
+        education_texts=tuple(texts["education"]),
+        education_weights=tuple(weights["education"]),
+        skill_weight=skill_weight,
+        experience_weight=exp_weight,
+        education_weight=edu_weight,
+        cat_skill=cat_skill,
+        cat_exp=cat_exp,
+        cat_edu=cat_edu,
+        text=" ".join(all_texts),
+    )
 
-    # Mean similarity score (0–1)
-    return sum(scores) / len(scores)
 
 # -----------------------------------------
 # Main scoring function
 # -----------------------------------------
 def compute_match_score(resume, job_requirements):
-    skills = resume.get("skills", [])
-    education = resume.get("education", [])
-    experience = resume.get("experience", [])
+    return compute_plan_score(build_ranking_profile(resume), compile_plan(job_requirements))
 
-    skill_sum = exp_sum = edu_sum = 0.0
-    skill_weight = exp_weight = edu_weight = 0.0
 
-    for req in job_requirements:
-        req_type = req["type"]
-        text = req["normalized_requirement"] or req["requirement"]
-        weight = req["weightage"]
+def compute_profile_score(profile, job_requirements):
+    return compute_plan_score(profile, compile_plan(job_requirements))
 
-        if req_type == "skill":
-            score = simple_skill_match(skills, text)
-            skill_sum += score * weight
-            skill_weight += weight
 
-        elif req_type == "experience":
-            score = experience_match(experience, text)
-            exp_sum += score * weight
-            exp_weight += weight
+def fill_score_matrix(profile, plan: ScoringPlan, matrix):
+    """
+    Add the score of every plan requirement missing from ``matrix``
+    ({requirement key: score}); columns already present are reused.
+    """
+    skills = profile["skills"]
+    experience_tokens = profile["experience_tokens"]
+    degrees = profile["degrees"]
 
-        elif req_type == "education":
-            score = education_match(education, text)
-            edu_sum += score * weight
-            edu_weight += weight
+    for key, text in zip(plan.skill_keys, plan.skill_texts):
+        if key not in matrix:
+            matrix[key] = match_skill_vocab(skills, text)
 
-    skill_score = skill_sum / skill_weight if skill_weight > 0 else 0
-    exp_score   = exp_sum   / exp_weight   if exp_weight > 0 else 0
-    edu_score   = edu_sum   / edu_weight   if edu_weight > 0 else 0
+    for key, (req_tokens, req_vocab) in zip(plan.experience_keys, plan.experience_tokens):
+        if key not in matrix:
+            matrix[key] = match_experience_tokens(experience_tokens, req_tokens, req_vocab)
 
-    total_category_weight = skill_weight + exp_weight + edu_weight
+    for key, text in zip(plan.education_keys, plan.education_texts):
+        if key not in matrix:
+            matrix[key] = match_degrees(degrees, text)
 
-    cat_skill = skill_weight / total_category_weight if total_category_weight > 0 else 0
-    cat_exp   = exp_weight   / total_category_weight if total_category_weight > 0 else 0
-    cat_edu   = edu_weight   / total_category_weight if total_category_weight > 0 else 0
+    return matrix
+
+
+def compute_plan_score(profile, plan: ScoringPlan, matrix=None):
+    """
+    Score a profile against a plan. Pass the applicant's stored score
+    ``matrix`` to recompute only new requirement columns; it is filled in place.
+    """
+    matrix = fill_score_matrix(profile, plan, {} if matrix is None else matrix)
+    return aggregate_scores(plan, matrix)
+
+
+def aggregate_scores(plan: ScoringPlan, matrix):
+    """Derive the category and final scores from per-requirement scores."""
+    skill_sum = sum(matrix[key] * weight for key, weight in zip(plan.skill_keys, plan.skill_weights))
+    exp_sum = sum(matrix[key] * weight for key, weight in zip(plan.experience_keys, plan.experience_weights))
+    edu_sum = sum(matrix[key] * weight for key, weight in zip(plan.education_keys, plan.education_weights))
+
+    skill_score = skill_sum / plan.skill_weight if plan.skill_weight > 0 else 0
+    exp_score   = exp_sum   / plan.experience_weight if plan.experience_weight > 0 else 0
+    edu_score   = edu_sum   / plan.education_weight if plan.education_weight > 0 else 0
 
     raw = (
-        skill_score * cat_skill +
-        exp_score   * cat_exp +
-        edu_score   * cat_edu
+        skill_score * plan.cat_skill +
+        exp_score   * plan.cat_exp +
+        edu_score   * plan.cat_edu
     )
 
     final_score = round(raw * 100, 2)
@@ -139,8 +292,180 @@ def compute_match_score(resume, job_requirements):
         "education_score": round(edu_score, 4),
         "final_score": final_score,
         "category_weights": {
-            "skills": round(cat_skill, 4),
-            "experience": round(cat_exp, 4),
-            "education": round(cat_edu, 4),
+            "skills": round(plan.cat_skill, 4),
+            "experience": round(plan.cat_exp, 4),
+            "education": round(plan.cat_edu, 4),
         }
     }
+
+
+# -----------------------------------------
+# TF-IDF similarity (whole applicant pool)
+# -----------------------------------------
+def profile_text(profile):
+    return " ".join(profile["skills"] + profile["degrees"] + profile["experience_tokens"])
+
+
+def tfidf_similarities(profiles, plan: ScoringPlan):
+    """
+    Cosine similarity of every profile to the job's requirements, from a
+    vectorizer fitted on this job's requirements and applicants only.
+    """
+    req_text = plan.text
+    if not profiles or not req_text.strip():
+        return np.zeros(len(profiles))
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)
+    try:
+        matrix = vectorizer.fit_transform([req_text] + [profile_text(p) for p in profiles])
+    except ValueError:
+        # Empty vocabulary (nothing but stop characters)
+        return np.zeros(len(profiles))
+
+    # One sparse product for the whole pool
+    return cosine_similarity(matrix[1:], matrix[0]).ravel()
+
+
+def _empty_scores():
+    return {
+        "skills_score": 0,
+        "experience_score": 0,
+        "education_score": 0,
+        "final_score": 0.0,
+        "category_weights": {"skills": 0, "experience": 0, "education": 0},
+    }
+
+
+def score_pool(profiles, plan: ScoringPlan, tfidf_weight=0.0, matrices=None):
+    """
+    Score many profiles against one job's compiled plan. With ``tfidf_weight`` > 0 the TF-IDF
+    similarity is blended into final_score; at 1.0 the fuzzy matchers are
+    skipped and final_score is the TF-IDF similarity alone.
+    ``matrices`` (one dict per profile) are the stored per-requirement
+    scores; only missing columns are computed, in place.
+    """
+    if matrices is None:
+        matrices = [{} for _ in profiles]
+
+    if tfidf_weight <= 0:
+        return [compute_plan_score(profile, plan, matrix) for profile, matrix in zip(profiles, matrices)]
+
+    similarities = tfidf_similarities(profiles, plan)
+    results = []
+
+    for profile, matrix, similarity in zip(profiles, matrices, similarities):
+        if tfidf_weight >= 1:
+            scores = _empty_scores()
+            blended = similarity * 100
+        else:
+            scores = compute_plan_score(profile, plan, matrix)
+            blended = (1 - tfidf_weight) * scores["final_score"] + tfidf_weight * similarity * 100
+
+        scores["tfidf_score"] = round(float(similarity), 4)
+        scores["final_score"] = round(float(blended), 2)
+        results.append(scores)
+
+    return results
+
+
+# -----------------------------------------
+# Top-K with upper-bound pruning
+# -----------------------------------------
+def experience_upper_bound(vocab, req_tokens):
+    """
+    Cheap upper bound of match_experience_tokens: 1.0 for a requirement word
+    found in the vocabulary, else the best Indel ratio its length allows
+    against the nearest vocabulary word lengths (a different word is at least
+    one edit away).
+    """
+    if not req_tokens or not vocab:
+        return 0.0
+
+    words = set(vocab)
+    lengths = sorted({len(word) for word in words})
+
+    total = 0.0
+    for word in req_tokens:
+        if word in words:
+            total += 1.0
+            continue
+        n = len(word)
+        j = bisect.bisect_left(lengths, n)
+        nearest = lengths[max(j - 1, 0):j + 1]
+        total += max(min(2 * min(n, m), n + m - 1) / (n + m) for m in nearest)
+    return total / len(req_tokens)
+
+
+def education_upper_bound(degrees, req):
+    """Cheap upper bound of match_degrees (difflib's character-multiset quick_ratio)."""
+    combined = " ".join(degrees)
+    if req in combined:
+        return 1.0
+    return SequenceMatcher(None, combined, req).quick_ratio()
+
+
+def top_k_pool(profiles, plan: ScoringPlan, k, tfidf_weight=0.0, matrices=None):
+    """
+    The k best profiles for a plan, as (position in ``profiles``, scores) best
+    first: the first k of score_pool's results sorted by final_score.
+
+    Skill columns are computed for everyone; the experience and education
+    columns (the expensive matchers) only for profiles whose upper bound can
+    still enter a bounded min-heap of the best k. Returns (top, fully scored count).
+    """
+    if matrices is None:
+        matrices = [{} for _ in profiles]
+
+    if tfidf_weight >= 1:
+        # TF-IDF only: nothing expensive to prune
+        results = score_pool(profiles, plan, tfidf_weight, matrices)
+        order = sorted(range(len(results)), key=lambda i: results[i]["final_score"], reverse=True)
+        return [(i, results[i]) for i in order[:k]], len(results)
+
+    similarities = tfidf_similarities(profiles, plan) if tfidf_weight > 0 else None
+
+    def blend(final_score, i):
+        if similarities is None:
+            return final_score
+        return round(float((1 - tfidf_weight) * final_score + tfidf_weight * similarities[i] * 100), 2)
+
+    # 1. Exact skill columns, optimistic experience and education columns
+    bounds = []
+    for i, (profile, matrix) in enumerate(zip(profiles, matrices)):
+        for key, text in zip(plan.skill_keys, plan.skill_texts):
+            if key not in matrix:
+                matrix[key] = match_skill_vocab(profile["skills"], text)
+
+        optimistic = dict(matrix)
+        for key, (req_tokens, _) in zip(plan.experience_keys, plan.experience_tokens):
+            if key not in optimistic:
+                optimistic[key] = experience_upper_bound(profile["experience_tokens"], req_tokens)
+        for key, text in zip(plan.education_keys, plan.education_texts):
+            if key not in optimistic:
+                optimistic[key] = education_upper_bound(profile["degrees"], text)
+
+        bounds.append((blend(aggregate_scores(plan, optimistic)["final_score"], i), i))
+
+    # 2. Most promising first; stop once no remaining bound reaches the heap
+    bounds.sort(key=lambda b: (-b[0], b[1]))
+    heap = []  # (final_score, -position, scores); ties keep the earlier position, like a stable sort
+    scored = 0
+
+    for bound, i in bounds:
+        if len(heap) >= k and bound < heap[0][0]:
+            break
+
+        scores = compute_plan_score(profiles[i], plan, matrices[i])
+        scored += 1
+        if similarities is not None:
+            scores["tfidf_score"] = round(float(similarities[i]), 4)
+            scores["final_score"] = blend(scores["final_score"], i)
+
+        entry = (scores["final_score"], -i, scores)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    top = sorted(heap, key=lambda e: (-e[0], -e[1]))
+    return [(-neg_i, scores) for _, neg_i, scores in top], scored
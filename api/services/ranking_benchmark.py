@@ -0,0 +1,207 @@
+"""
+Microbenchmarks for the ranking matchers on seeded synthetic data.
+
+    python -m api.services.ranking_benchmark --out ranking-bench.json
+
+Reports throughput and p50/p95 latency of compute_match_score and of each
+matcher, plus scaling curves over applicant count (pool scoring) and
+experience description length. Run it on two commits with the same seed
+and compare the JSON files before rolling out ranking changes.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import rapidfuzz
+
+from .ranking import (
+    build_ranking_profile,
+    compile_plan,
+    compute_match_score,
+    education_match,
+    experience_match,
+    score_pool,
+    simple_skill_match,
+    top_k_pool,
+)
+from .ranking_parity import DEGREES, EXPERIENCE_REQUIREMENTS, SKILLS, WORDS
+
+
+# -----------------------------------------
+# Synthetic data
+# -----------------------------------------
+def make_resume(rng: random.Random, skill_count: int, description_words: int, experiences: int = 3) -> Dict[str, Any]:
+    return {
+        "skills": rng.sample(SKILLS, min(skill_count, len(SKILLS))),
+        "education": [{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(1, 2))],
+        "experience": [
+            {"description": " ".join(rng.choice(WORDS) for _ in range(description_words // experiences))}
+            for _ in range(experiences)
+        ],
+    }
+
+
+def make_requirements(rng: random.Random, skills: int = 6, experience: int = 2, education: int = 1) -> List[Dict[str, Any]]:
+    requirements = []
+    for text in rng.sample(SKILLS, skills):
+        requirements.append({"type": "skill", "requirement": text, "normalized_requirement": None, "weightage": rng.uniform(0.2, 1.0)})
+    for text in rng.sample(EXPERIENCE_REQUIREMENTS, experience):
+        requirements.append({"type": "experience", "requirement": text, "normalized_requirement": None, "weightage": rng.uniform(0.2, 1.0)})
+    for text in rng.sample(DEGREES, education):
+        requirements.append({"type": "education", "requirement": text, "normalized_requirement": None, "weightage": rng.uniform(0.2, 1.0)})
+    return requirements
+
+
+def make_pool(rng: random.Random, count: int, description_words: Sequence[int] = (20, 400)) -> List[Dict[str, Any]]:
+    """Resumes with 0-25 skills and experience descriptions of varying length."""
+    return [
+        make_resume(rng, rng.randint(0, 25), rng.randint(*description_words))
+        for _ in range(count)
+    ]
+
+
+# -----------------------------------------
+# Measurement
+# -----------------------------------------
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    latencies = np.array(samples) * 1000.0
+    total = float(np.sum(samples))
+    return {
+        "calls": len(samples),
+        "throughput_per_s": round(len(samples) / total, 1) if total > 0 else None,
+        "mean_ms": round(float(latencies.mean()), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 4),
+    }
+
+
+def measure(fn: Callable[..., Any], argument_sets: Sequence[tuple]) -> Dict[str, float]:
+    """Time one call per argument set with a monotonic clock."""
+    samples = []
+    for args in argument_sets:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return _summarize(samples)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+# -----------------------------------------
+# Suite
+# -----------------------------------------
+def run(
+    seed: int = 42,
+    applicants: int = 500,
+    pool_sizes: Sequence[int] = (100, 500, 1000, 2000),
+    description_lengths: Sequence[int] = (25, 100, 400, 1600),
+    top_k: int = 20,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    resumes = make_pool(rng, applicants)
+    jobs = [make_requirements(rng) for _ in range(5)]
+
+    # One (resume, job) pair per call, cycling through the jobs
+    pairs = [(resume, jobs[i % len(jobs)]) for i, resume in enumerate(resumes)]
+
+    def per_requirement(req_type: str, field: str) -> List[tuple]:
+        return [
+            (resume[field], req["requirement"])
+            for resume, job in pairs
+            for req in job
+            if req["type"] == req_type
+        ]
+
+    results: Dict[str, Any] = {
+        "compute_match_score": measure(compute_match_score, pairs),
+        "matchers": {
+            "simple_skill_match": measure(simple_skill_match, per_requirement("skill", "skills")),
+            "experience_match": measure(experience_match, per_requirement("experience", "experience")),
+            "education_match": measure(education_match, per_requirement("education", "education")),
+        },
+    }
+
+    # Pool scoring (what job ranking runs) and the pruned top-K ranker, timed per pool
+    plan = compile_plan(jobs[0])
+    scaling_pool = []
+    for size in pool_sizes:
+        pool_rng = random.Random(seed + size)
+        profiles = [build_ranking_profile(resume) for resume in make_pool(pool_rng, size)]
+        start = time.perf_counter()
+        score_pool(profiles, plan)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        _, scored = top_k_pool(profiles, plan, top_k)
+        top_elapsed = time.perf_counter() - start
+        scaling_pool.append({
+            "applicants": size,
+            "seconds": round(elapsed, 4),
+            "applicants_per_s": round(size / elapsed, 1) if elapsed > 0 else None,
+            f"top_{top_k}_seconds": round(top_elapsed, 4),
+            f"top_{top_k}_fully_scored": scored,
+        })
+    results["scaling_applicants"] = scaling_pool
+
+    # experience_match against growing descriptions
+    requirement = EXPERIENCE_REQUIREMENTS[0]
+    scaling_length = []
+    for words in description_lengths:
+        length_rng = random.Random(seed + words)
+        argument_sets = [
+            (make_resume(length_rng, 5, words)["experience"], requirement)
+            for _ in range(50)
+        ]
+        scaling_length.append({"description_words": words, **measure(experience_match, argument_sets)})
+    results["scaling_description_length"] = scaling_length
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "rapidfuzz": rapidfuzz.__version__,
+            "seed": seed,
+            "applicants": applicants,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ranking microbenchmarks")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--applicants", type=int, default=500)
+    parser.add_argument("--quick", action="store_true", help="small pools for a fast smoke run")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        report = run(args.seed, min(args.applicants, 100), pool_sizes=(50, 100), description_lengths=(25, 100))
+    else:
+        report = run(args.seed, args.applicants)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.out}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Parity check between the matchers in ranking.py (skill and experience on
+rapidfuzz kernels) and the original difflib implementation.
+
+    python -m api.services.ranking_parity
+
+Prints the largest score difference per matcher and exits non-zero when one
+exceeds the tolerance. difflib's Ratcliff/Obershelp ratio and rapidfuzz's
+Indel ratio agree exactly on most inputs and differ slightly on some.
+"""
+import random
+import sys
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Tuple
+
+from .ranking import (
+    compute_match_score,
+    education_match,
+    experience_match,
+    normalize,
+    simple_skill_match,
+)
+
+DEFAULT_TOLERANCE = 0.05
+
+
+# -----------------------------------------
+# Reference (difflib) implementations
+# -----------------------------------------
+def difflib_skill_match(skills, requirement):
+    req = normalize(requirement)
+    best_score = 0.0
+    for skill in skills:
+        s = normalize(skill)
+        if s == req:
+            return 1.0
+        if req in s:
+            best_score = max(best_score, 0.9)
+        ratio = SequenceMatcher(None, s, req).ratio()
+        if ratio > 0.8:
+            best_score = max(best_score, ratio)
+    return best_score
+
+
+def difflib_education_match(education_list, requirement):
+    req = normalize(requirement)
+    combined = " ".join([normalize(e.get("degree", "")) for e in education_list])
+    if req in combined:
+        return 1.0
+    return SequenceMatcher(None, combined, req).ratio()
+
+
+def difflib_experience_match(experience_list, requirement):
+    req_tokens = normalize(requirement).split()
+    combined_desc = " ".join([normalize(e.get("description", "")) for e in experience_list])
+    desc_tokens = combined_desc.split()
+    if not req_tokens or not desc_tokens:
+        return 0.0
+    scores = []
+    for req_word in req_tokens:
+        best = 0.0
+        for exp_word in desc_tokens:
+            ratio = SequenceMatcher(None, req_word, exp_word).ratio()
+            if ratio > best:
+                best = ratio
+        scores.append(best)
+    return sum(scores) / len(scores)
+
+
+# -----------------------------------------
+# Sample corpus
+# -----------------------------------------
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "ReactJS", "React Native",
+    "Node.js", "NodeJS", "Express", "Django", "Flask", "FastAPI", "SQL", "PostgreSQL",
+    "MySQL", "MongoDB", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Git",
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy",
+    "C++", "C#", ".NET", "Go", "Rust", "Figma", "Tableau", "Power BI", "Excel",
+    "Communication", "Leadership", "Project Management", "Agile", "Scrum",
+]
+
+DEGREES = [
+    "Bachelor of Science in Computer Science", "Bachelor of Computer Science (Hons)",
+    "Master of Business Administration", "Diploma in Information Technology",
+    "Bachelor of Engineering in Electrical Engineering", "PhD in Data Science",
+    "Master of Science in Artificial Intelligence", "Foundation in Science",
+]
+
+WORDS = (
+    "developed maintained designed implemented led managed built deployed "
+    "scalable web applications services apis microservices data pipelines "
+    "dashboards using python java react node docker kubernetes aws cloud "
+    "team of engineers customers stakeholders requirements testing ci cd "
+    "improved performance reduced latency automated reporting analytics "
+    "machine learning models production monitoring agile sprints"
+).split()
+
+EXPERIENCE_REQUIREMENTS = [
+    "3 years experience building web applications",
+    "experience with cloud deployment on AWS",
+    "led a team of engineers",
+    "built data pipelines and dashboards",
+    "machine learning models in production",
+]
+
+
+def sample_cases(seed: int = 7, count: int = 300) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        resume = {
+            "skills": rng.sample(SKILLS, rng.randint(0, 15)),
+            "education": [{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(0, 2))],
+            "experience": [
+                {"description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60)))}
+                for _ in range(rng.randint(0, 4))
+            ],
+        }
+        requirements = (
+            [{"type": "skill", "requirement": s, "normalized_requirement": None, "weightage": rng.random()}
+             for s in rng.sample(SKILLS, 5)]
+            + [{"type": "education", "requirement": rng.choice(DEGREES), "normalized_requirement": None, "weightage": 0.5}]
+            + [{"type": "experience", "requirement": rng.choice(EXPERIENCE_REQUIREMENTS), "normalized_requirement": None, "weightage": 0.5}]
+        )
+        cases.append((resume, requirements))
+    return cases
+
+
+# -----------------------------------------
+# Check
+# -----------------------------------------
+MATCHERS: List[Tuple[str, str, Callable, Callable]] = [
+    ("skill", "skills", simple_skill_match, difflib_skill_match),
+    ("education", "education", education_match, difflib_education_match),
+    ("experience", "experience", experience_match, difflib_experience_match),
+]
+
+
+def check_parity(cases=None) -> Dict[str, float]:
+    """Largest absolute difference between the two implementations, per matcher and for final scores (0-1)."""
+    cases = cases if cases is not None else sample_cases()
+    worst = {name: 0.0 for name, _, _, _ in MATCHERS}
+    worst["final_score"] = 0.0
+
+    for resume, requirements in cases:
+        for name, field, fast, reference in MATCHERS:
+            for req in requirements:
+                if req["type"] != name:
+                    continue
+                diff = abs(fast(resume[field], req["requirement"]) - reference(resume[field], req["requirement"]))
+                worst[name] = max(worst[name], diff)
+
+        fast_final = compute_match_score(resume, requirements)["final_score"]
+        reference_final = _reference_final_score(resume, requirements)
+        worst["final_score"] = max(worst["final_score"], abs(fast_final - reference_final) / 100.0)
+
+    return worst
+
+
+def _reference_final_score(resume, requirements) -> float:
+    """The original compute_match_score, on the difflib matchers."""
+    reference = {
+        "skill": (difflib_skill_match, "skills"),
+        "experience": (difflib_experience_match, "experience"),
+        "education": (difflib_education_match, "education"),
+    }
+    sums = {name: 0.0 for name in reference}
+    weights = {name: 0.0 for name in reference}
+
+    for req in requirements:
+        if req["type"] not in reference:
+            continue
+        matcher, field = reference[req["type"]]
+        text = req["normalized_requirement"] or req["requirement"]
+        sums[req["type"]] += matcher(resume.get(field, []), text) * req["weightage"]
+        weights[req["type"]] += req["weightage"]
+
+    total = sum(weights.values())
+    if total <= 0:
+        return 0.0
+
+    raw = sum((sums[name] / weights[name]) * (weights[name] / total) for name in reference if weights[name] > 0)
+    return round(raw * 100, 2)
+
+
+def main(tolerance: float = DEFAULT_TOLERANCE) -> int:
+    worst = check_parity()
+    failed = False
+    for name, diff in worst.items():
+        ok = diff <= tolerance
+        failed |= not ok
+        print(f"{name:12s} max |diff| = {diff:.4f}  {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TOLERANCE))
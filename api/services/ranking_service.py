@@ -1,18 +1,176 @@
+import asyncio
+import hashlib
 import json
-from .ranking import compute_match_score
-from api.supabase_client import supabase
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .ranking import (
+    PROFILE_VERSION,
+    SCORE_MATRIX_VERSION,
+    ScoringPlan,
+    build_ranking_profile,
+    compute_plan_score,
+    score_pool,
+    top_k_pool,
+)
+from .scoring_plans import plan_cache
+from .skill_index import skill_index
+from api.settings import (
+    RANK_SCORING_MODE,
+    RANK_SHORTLIST_FACTOR,
+    RANK_SHORTLIST_MIN,
+    RANK_TFIDF_WEIGHT,
+    SKILL_INDEX_MAX_AGE_SECONDS,
+)
+from api.supabase_client import get_async_supabase
+
+# PostgREST caps every response at max_rows (supabase/config.toml)
+PAGE_SIZE = 1000
+
+# Keeps `in.(...)` filters well below URL length limits
+IN_FILTER_CHUNK = 500
+
+
+# Resume columns the ranker reads (rebuilt profiles go back through update_ranking_profiles)
+RESUME_RANKING_COLUMNS = (
+    "resume_id, job_seeker_id, status, "
+    "extracted_skills, extracted_education, extracted_experiences, ranking_profile"
+)
+
+
+def parse_resume(resume_row: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a `resume` row into the dict `compute_match_score` expects."""
+    return {
+        "skills": json.loads(resume_row["extracted_skills"] or "[]"),
+        "education": json.loads(resume_row["extracted_education"] or "[]"),
+        "experience": json.loads(resume_row["extracted_experiences"] or "[]"),
+    }
+
+
+def tfidf_weight(mode: Optional[str] = None) -> float:
+    """Blend weight of the TF-IDF similarity for a scoring mode (defaults to RANK_SCORING_MODE)."""
+    return RANK_TFIDF_WEIGHT if (mode or RANK_SCORING_MODE) == "tfidf" else 0.0
+
+
+# -----------------------------------------
+# Requirement scoring plans
+# -----------------------------------------
+async def _load_requirements(job_id: int) -> List[Dict[str, Any]]:
+    db = await get_async_supabase()
+    res = await db.table("job_requirement").select("*").eq("job_id", job_id).execute()
+    return res.data or []
+
+
+async def job_plan(job_id: int) -> ScoringPlan:
+    """The job's compiled requirements; only a cache miss queries job_requirement."""
+    return await plan_cache.get(job_id, _load_requirements)
+
+
+def invalidate_job_plan(job_id: int) -> Dict[str, Any]:
+    """Hook for the recruiter edit route: the next ranking of this job recompiles its requirements."""
+    return {"job_id": job_id, "requirement_version": plan_cache.invalidate(job_id)}
+
+
+# -----------------------------------------
+# Stored per-requirement score matrix
+# -----------------------------------------
+def load_score_matrix(application: Dict[str, Any], profile: Dict[str, Any]) -> Dict[str, float]:
+    """
+    The application's stored per-requirement scores, or an empty matrix when
+    they were computed from an older resume profile or matcher version.
+    """
+    stored = application.get("requirement_scores")
+    if isinstance(stored, str):
+        stored = json.loads(stored)
+
+    if (
+        stored
+        and stored.get("version") == SCORE_MATRIX_VERSION
+        and stored.get("profile") == profile.get("source_hash")
+    ):
+        return dict(stored.get("scores") or {})
+    return {}
+
+
+def score_matrix_payload(plan: ScoringPlan, matrix: Dict[str, float], profile: Dict[str, Any]) -> Dict[str, Any]:
+    """What is stored in `application.requirement_scores`: the current requirements' columns only."""
+    keys = plan.skill_keys + plan.experience_keys + plan.education_keys
+    return {
+        "version": SCORE_MATRIX_VERSION,
+        "profile": profile.get("source_hash"),
+        "scores": {key: matrix[key] for key in keys if key in matrix},
+    }
+
+
+# -----------------------------------------
+# Stored ranking profiles
+# -----------------------------------------
+def _profile_source_hash(resume_row: Dict[str, Any]) -> str:
+    digest = hashlib.sha256()
+    for column in ("extracted_skills", "extracted_education", "extracted_experiences"):
+        digest.update((resume_row.get(column) or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_ranking_profile(resume_row: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return (profile, rebuilt). The stored `resume.ranking_profile` is used as
+    is unless its schema version is old or the extracted fields were edited
+    since it was built; then it is rebuilt and the caller should store it.
+    """
+    source_hash = _profile_source_hash(resume_row)
+
+    stored = resume_row.get("ranking_profile")
+    if isinstance(stored, str):
+        stored = json.loads(stored)
+
+    if stored and stored.get("version") == PROFILE_VERSION and stored.get("source_hash") == source_hash:
+        return stored, False
+
+    profile = build_ranking_profile(parse_resume(resume_row))
+    profile["source_hash"] = source_hash
+    return profile, True
+
+
+def sync_skill_index(resume_row: Dict[str, Any], profile: Dict[str, Any]):
+    """Put a (re)built profile in the skill index; soft-deleted resumes are dropped from it instead."""
+    if resume_row.get("status") == "deleted":
+        skill_index.remove(resume_row["resume_id"])
+    else:
+        skill_index.upsert(resume_row["resume_id"], resume_row["job_seeker_id"], profile)
+
+
+async def store_ranking_profiles(rebuilt: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+    """
+    Bulk-write (resume row, profile) pairs into `resume.ranking_profile`
+    through update_ranking_profiles (update only: a resume deleted since it
+    was read is not re-created).
+    """
+    if not rebuilt:
+        return
+    db = await get_async_supabase()
+    await db.rpc(
+        "update_ranking_profiles",
+        {"profiles": [{"resume_id": row["resume_id"], "ranking_profile": profile} for row, profile in rebuilt]},
+    ).execute()
+
 
 async def rank_application(application_id: int):
     """
     1. Fetch application row
-    2. Fetch resume (skills, education, experience)
-    3. Fetch job requirements
-    4. Compute score
-    5. Update application.match_score
+    2. Fetch resume (skills, education, experience) and job requirements, concurrently
+    3. Compute score
+    4. Update application.match_score (and the resume's profile if it was rebuilt)
+
+    In "tfidf" mode the TF-IDF term is fitted on the job's whole applicant
+    pool, and a new applicant changes that fit for everyone, so the whole job
+    is re-ranked instead; every stored match_score of a job stays on one scale.
     """
+    db = await get_async_supabase()
 
     # 1. Get application
-    app_res = supabase.table("application").select("*").eq("application_id", application_id).single().execute()
+    app_res = await db.table("application").select("*").eq("application_id", application_id).single().execute()
     if not app_res.data:
         raise Exception("Application not found")
 
@@ -20,29 +178,48 @@ async def rank_application(application_id: int):
     resume_id = application.get("resume_id")
     job_id = application.get("job_id")
 
-    # 2. Get resume data
-    resume_res = supabase.table("resume").select("*").eq("resume_id", resume_id).single().execute()
-    resume_row = resume_res.data
+    if tfidf_weight() > 0:
+        # Stored per-requirement scores are reused, so only the new applicant's
+        # matchers and the pool's TF-IDF fit are computed
+        ranking = await rank_job(job_id)
+        scores = next(
+            (a["scores"] for a in ranking["applications"] if a["application_id"] == application_id),
+            None,
+        )
+        if scores is None:
+            raise Exception("Resume not found for application")
+        return {
+            "application_id": application_id,
+            "job_id": job_id,
+            "resume_id": resume_id,
+            "scores": scores,
+        }
 
-    resume = {
-        "skills": json.loads(resume_row["extracted_skills"] or "[]"),
-        "education": json.loads(resume_row["extracted_education"] or "[]"),
-        "experience": json.loads(resume_row["extracted_experiences"] or "[]"),
-    }
+    # 2. Resume data and the job's compiled requirements don't depend on each other
+    resume_res, plan = await asyncio.gather(
+        db.table("resume").select(RESUME_RANKING_COLUMNS).eq("resume_id", resume_id).single().execute(),
+        job_plan(job_id),
+    )
 
-    # 3. Get job requirements
-    req_res = supabase.table("job_requirement").select("*").eq("job_id", job_id).execute()
-    job_requirements = req_res.data
+    # Normalized once, then read from its stored profile
+    profile, rebuilt = load_ranking_profile(resume_res.data)
 
-    # 4. Compute score
-    result = compute_match_score(resume, job_requirements)
+    # 3. Compute score (only requirements without a stored score)
+    matrix = load_score_matrix(application, profile)
+    result = compute_plan_score(profile, plan, matrix)
     final_score = result["final_score"]
 
-    # 5. Update application.match_score
-    supabase.table("application")\
-        .update({"match_score": final_score})\
-        .eq("application_id", application_id)\
+    # 4. Update application.match_score and its per-requirement scores
+    writes = [
+        db.table("application")
+        .update({"match_score": final_score, "requirement_scores": score_matrix_payload(plan, matrix, profile)})
+        .eq("application_id", application_id)
         .execute()
+    ]
+    if rebuilt:
+        writes.append(db.table("resume").update({"ranking_profile": profile}).eq("resume_id", resume_id).execute())
+        sync_skill_index(resume_res.data, profile)
+    await asyncio.gather(*writes)
 
     return {
         "application_id": application_id,
@@ -50,3 +227,273 @@ async def rank_application(application_id: int):
         "resume_id": resume_id,
         "scores": result
     }
+
+
+# -----------------------------------------
+# Job-level bulk ranking
+# -----------------------------------------
+async def fetch_pages(build_query) -> List[Dict[str, Any]]:
+    """Run a select page by page until a short page comes back."""
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        res = await build_query().range(start, start + PAGE_SIZE - 1).execute()
+        page = res.data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+async def _fetch_resumes(resume_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    db = await get_async_supabase()
+    # The `in.(...)` chunks are independent requests
+    pages = await asyncio.gather(*[
+        db.table("resume")
+        .select(RESUME_RANKING_COLUMNS)
+        .in_("resume_id", resume_ids[i:i + IN_FILTER_CHUNK])
+        .execute()
+        for i in range(0, len(resume_ids), IN_FILTER_CHUNK)
+    ])
+    resumes: Dict[int, Dict[str, Any]] = {}
+    for res in pages:
+        for row in res.data or []:
+            resumes[row["resume_id"]] = row
+    return resumes
+
+
+def _score_job(
+    applications: List[Dict[str, Any]],
+    resumes: Dict[int, Dict[str, Any]],
+    plan: ScoringPlan,
+    mode: Optional[str],
+    top: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], List[int], Dict[int, Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]], int]:
+    """
+    Score the applications in memory: (ranked, skipped ids, profiles, rebuilt
+    profiles, pruned count). With ``top`` only the best ``top`` are returned,
+    and applicants that can't reach them are never fully scored.
+    """
+    profiles: Dict[int, Dict[str, Any]] = {}
+    rebuilt_profiles = []
+    for resume_id, row in resumes.items():
+        profiles[resume_id], rebuilt = load_ranking_profile(row)
+        if rebuilt:
+            rebuilt_profiles.append((row, profiles[resume_id]))
+            sync_skill_index(row, profiles[resume_id])
+
+    ranked = []
+    skipped = []
+
+    for application in applications:
+        resume_id = application.get("resume_id")
+        if resume_id not in profiles:
+            skipped.append(application["application_id"])
+            continue
+
+        ranked.append({
+            "application_id": application["application_id"],
+            "job_seeker_id": application["job_seeker_id"],
+            "resume_id": resume_id,
+            # Stored scores are reused; after a requirement edit only its column is computed
+            "matrix": load_score_matrix(application, profiles[resume_id]),
+        })
+
+    pool_profiles = [profiles[r["resume_id"]] for r in ranked]
+    matrices = [r["matrix"] for r in ranked]
+
+    if top is not None:
+        best, scored = top_k_pool(pool_profiles, plan, top, tfidf_weight(mode), matrices)
+        pruned = len(ranked) - scored
+        ranked = [dict(ranked[i], scores=scores) for i, scores in best]
+        return ranked, skipped, profiles, rebuilt_profiles, pruned
+
+    pool_scores = score_pool(pool_profiles, plan, tfidf_weight(mode), matrices)
+    for r, scores in zip(ranked, pool_scores):
+        r["scores"] = scores
+
+    return ranked, skipped, profiles, rebuilt_profiles, 0
+
+
+async def _store_job_scores(plan: ScoringPlan, ranked, profiles):
+    """
+    One bulk write of every match_score and score matrix, through the
+    update_application_scores function: update only, so an application
+    deleted since it was read is not re-created.
+    """
+    if not ranked:
+        return
+    db = await get_async_supabase()
+    await db.rpc(
+        "update_application_scores",
+        {
+            "scores": [
+                {
+                    "application_id": r["application_id"],
+                    "match_score": r["scores"]["final_score"],
+                    "requirement_scores": score_matrix_payload(plan, r["matrix"], profiles[r["resume_id"]]),
+                }
+                for r in ranked
+            ]
+        },
+    ).execute()
+
+
+async def rank_job(job_id: int, mode: Optional[str] = None, top: Optional[int] = None):
+    """
+    Re-score every application of a job: three set-based reads
+    (applications, resumes, requirements) and one bulk update of match_score.
+    ``mode`` ("fuzzy" | "tfidf") overrides RANK_SCORING_MODE for this call
+    only: scores in another mode are returned but not stored. Together with
+    rank_application re-ranking the job in "tfidf" mode, every stored
+    match_score of a job comes from one mode (and, for TF-IDF, one fit).
+
+    With ``top`` only the best ``top`` applications are scored exactly and
+    returned; nothing is written, since the pruned applications would keep
+    match_scores from older requirements next to the fresh ones.
+    """
+    db = await get_async_supabase()
+
+    # 1. Every application of the job, and the job's compiled requirements (shared
+    # by every application), concurrently
+    applications, plan = await asyncio.gather(
+        fetch_pages(
+            lambda: db.table("application")
+            .select("application_id, job_id, job_seeker_id, resume_id, requirement_scores")
+            .eq("job_id", job_id)
+            .order("application_id")
+        ),
+        job_plan(job_id),
+    )
+
+    # 2. All their resumes at once
+    resume_ids = sorted({a["resume_id"] for a in applications if a.get("resume_id") is not None})
+    resumes = await _fetch_resumes(resume_ids)
+
+    # 3. Score everything in memory, from the stored ranking profiles (off the event loop)
+    ranked, skipped, profiles, rebuilt_profiles, pruned = await asyncio.to_thread(
+        _score_job, applications, resumes, plan, mode, top
+    )
+
+    # 4. Scores of a full ranking in the configured mode, and the profiles that were missing or stale (for the next ranking)
+    store_scores = top is None and (mode or RANK_SCORING_MODE) == RANK_SCORING_MODE
+    writes = [store_ranking_profiles(rebuilt_profiles)]
+    if store_scores:
+        writes.append(_store_job_scores(plan, ranked, profiles))
+    await asyncio.gather(*writes)
+
+    ranked.sort(key=lambda r: r["scores"]["final_score"], reverse=True)
+
+    return {
+        "job_id": job_id,
+        "mode": mode or RANK_SCORING_MODE,
+        "ranked": len(ranked),
+        "pruned": pruned,
+        "stored": store_scores,
+        "skipped_application_ids": skipped,
+        "applications": [
+            {
+                "application_id": r["application_id"],
+                "resume_id": r["resume_id"],
+                "scores": r["scores"],
+            }
+            for r in ranked
+        ],
+    }
+
+
+# -----------------------------------------
+# Talent pool top-K (skill index)
+# -----------------------------------------
+_index_load_lock = asyncio.Lock()
+
+
+def _index_entries(rows: List[Dict[str, Any]]):
+    """(index entries, rebuilt profiles) for a page of resume rows."""
+    entries = []
+    rebuilt_profiles = []
+    for row in rows:
+        profile, rebuilt = load_ranking_profile(row)
+        entries.append((row["resume_id"], row["job_seeker_id"], profile))
+        if rebuilt:
+            rebuilt_profiles.append((row, profile))
+    return entries, rebuilt_profiles
+
+
+async def load_skill_index():
+    """(Re)build the skill index from every resume in the database that is not deleted."""
+    db = await get_async_supabase()
+    rows = await fetch_pages(
+        lambda: db.table("resume").select(RESUME_RANKING_COLUMNS).neq("status", "deleted").order("resume_id")
+    )
+
+    entries, rebuilt_profiles = await asyncio.to_thread(_index_entries, rows)
+
+    await store_ranking_profiles(rebuilt_profiles)
+    skill_index.replace(entries)
+
+
+async def _ensure_skill_index():
+    async with _index_load_lock:
+        loaded_at = skill_index.loaded_at
+        if loaded_at is None or time.time() - loaded_at > SKILL_INDEX_MAX_AGE_SECONDS:
+            await load_skill_index()
+
+
+async def index_resume(resume_id: int):
+    """Add, refresh or (if deleted) drop one resume in the skill index after it is saved, edited or deleted."""
+    db = await get_async_supabase()
+    res = await (
+        db.table("resume")
+        .select(RESUME_RANKING_COLUMNS)
+        .eq("resume_id", resume_id)
+        .neq("status", "deleted")
+        .execute()
+    )
+    if not res.data:
+        skill_index.remove(resume_id)
+        return {"resume_id": resume_id, "indexed": False}
+
+    row = res.data[0]
+    profile, rebuilt = load_ranking_profile(row)
+    if rebuilt:
+        await store_ranking_profiles([(row, profile)])
+    skill_index.upsert(resume_id, row["job_seeker_id"], profile)
+    return {"resume_id": resume_id, "indexed": True}
+
+
+def _score_shortlist(plan: ScoringPlan, k: int, mode: Optional[str]) -> Dict[str, Any]:
+    # Snapshots of the shortlisted entries; later index updates don't affect this query
+    shortlist = skill_index.shortlist(plan, max(k * RANK_SHORTLIST_FACTOR, RANK_SHORTLIST_MIN))
+
+    pool_scores = score_pool([profile for _, _, profile in shortlist], plan, tfidf_weight(mode))
+
+    candidates = [
+        {"resume_id": resume_id, "job_seeker_id": job_seeker_id, "scores": scores}
+        for (resume_id, job_seeker_id, _), scores in zip(shortlist, pool_scores)
+    ]
+
+    candidates.sort(key=lambda c: c["scores"]["final_score"], reverse=True)
+
+    return {
+        "shortlisted": len(shortlist),
+        "candidates": candidates[:k],
+    }
+
+
+async def top_candidates(job_id: int, k: int, mode: Optional[str] = None):
+    """
+    Best k resumes in the whole talent pool for a job: the skill index picks
+    a shortlist, and only the shortlist is scored.
+    """
+    # The index (re)load and the job's requirements don't depend on each other
+    _, plan = await asyncio.gather(_ensure_skill_index(), job_plan(job_id))
+
+    scored = await asyncio.to_thread(_score_shortlist, plan, k, mode)
+
+    return {
+        "job_id": job_id,
+        "mode": mode or RANK_SCORING_MODE,
+        "pool_size": len(skill_index),
+        **scored,
+    }
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from .ranking import ScoringPlan, compile_plan
+from api.settings import PLAN_CACHE_ENTRIES, PLAN_CACHE_TTL_SECONDS
+
+
+# -----------------------------------------
+# LRU of compiled scoring plans
+# -----------------------------------------
+class PlanCache:
+    """
+    Compiled scoring plans keyed by (job_id, requirement version).
+
+    The version of a job is bumped by ``invalidate`` (called when a recruiter
+    edits the job), so the next ranking misses and recompiles from fresh
+    requirements. Entries also expire after ``ttl_seconds``, which bounds
+    staleness for edits made through another API instance.
+    """
+
+    def __init__(self, max_entries: int = PLAN_CACHE_ENTRIES, ttl_seconds: int = PLAN_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+        # (job_id, version) -> (compiled at, plan)
+        self._plans: "OrderedDict[Tuple[int, int], Tuple[float, ScoringPlan]]" = OrderedDict()
+
+    def version(self, job_id: int) -> int:
+        with self._lock:
+            return self._versions.get(job_id, 0)
+
+    async def get(
+        self, job_id: int, load_requirements: Callable[[int], Awaitable[List[Dict[str, Any]]]]
+    ) -> ScoringPlan:
+        """Return the job's plan, compiling it from ``await load_requirements(job_id)`` on a miss."""
+        with self._lock:
+            key = (job_id, self._versions.get(job_id, 0))
+            entry = self._plans.get(key)
+            if entry is not None and time.time() - entry[0] <= self.ttl_seconds:
+                self._plans.move_to_end(key)
+                return entry[1]
+
+        plan = compile_plan(await load_requirements(job_id))
+
+        with self._lock:
+            # An invalidation while compiling means these requirements may be stale
+            if self._versions.get(job_id, 0) == key[1]:
+                self._plans[key] = (time.time(), plan)
+                self._plans.move_to_end(key)
+                while len(self._plans) > self.max_entries:
+                    self._plans.popitem(last=False)
+
+        return plan
+
+    def invalidate(self, job_id: int) -> int:
+        """Drop the job's plan; returns the new requirement version."""
+        with self._lock:
+            version = self._versions.get(job_id, 0) + 1
+            self._versions[job_id] = version
+            for key in [key for key in self._plans if key[0] == job_id]:
+                del self._plans[key]
+            return version
+
+
+plan_cache = PlanCache()
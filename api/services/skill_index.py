@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+from .ranking import FUZZY_SKILL_CUTOFF, ScoringPlan
+
+
+# -----------------------------------------
+# Inverted index over ranking profiles
+# -----------------------------------------
+class SkillIndex:
+    """
+    In-process inverted index of the talent pool: normalized skills, degree
+    words and experience words, each mapped to the resumes that contain them.
+
+    It only picks a shortlist for a job; the shortlist is then scored
+    exactly from the ranking profiles kept alongside the postings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[int, Dict[str, Any]] = {}
+        self._owners: Dict[int, Optional[int]] = {}
+        self._skills: Dict[str, Set[int]] = defaultdict(set)
+        self._degree_tokens: Dict[str, Set[int]] = defaultdict(set)
+        self._experience_tokens: Dict[str, Set[int]] = defaultdict(set)
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    # ---- updates ----
+    def _postings(self, profile: Dict[str, Any]):
+        yield self._skills, {s for s in profile["skills"] if s}
+        yield self._degree_tokens, {t for degree in profile["degrees"] for t in degree.split()}
+        yield self._experience_tokens, set(profile["experience_tokens"])
+
+    def _add(self, resume_id: int, job_seeker_id: Optional[int], profile: Dict[str, Any]):
+        self._profiles[resume_id] = profile
+        self._owners[resume_id] = job_seeker_id
+        for postings, terms in self._postings(profile):
+            for term in terms:
+                postings[term].add(resume_id)
+
+    def _remove(self, resume_id: int):
+        profile = self._profiles.pop(resume_id, None)
+        self._owners.pop(resume_id, None)
+        if profile is None:
+            return
+        for postings, terms in self._postings(profile):
+            for term in terms:
+                ids = postings.get(term)
+                if ids is not None:
+                    ids.discard(resume_id)
+                    if not ids:
+                        del postings[term]
+
+    def upsert(self, resume_id: int, job_seeker_id: Optional[int], profile: Dict[str, Any]):
+        with self._lock:
+            self._remove(resume_id)
+            self._add(resume_id, job_seeker_id, profile)
+
+    def remove(self, resume_id: int):
+        with self._lock:
+            self._remove(resume_id)
+
+    def replace(self, entries: Iterable[Tuple[int, Optional[int], Dict[str, Any]]]):
+        """Rebuild the whole index from (resume_id, job_seeker_id, profile) entries."""
+        with self._lock:
+            self._profiles.clear()
+            self._owners.clear()
+            self._skills.clear()
+            self._degree_tokens.clear()
+            self._experience_tokens.clear()
+            for resume_id, job_seeker_id, profile in entries:
+                self._add(resume_id, job_seeker_id, profile)
+            self.loaded_at = time.time()
+
+    # ---- lookups ----
+    def _matching_skills(self, req: str) -> List[str]:
+        # Same rules as match_skill_vocab: exact, substring, or fuzzy above the cutoff
+        vocab = list(self._skills)
+        matched = {skill for skill in vocab if req in skill}
+        for skill, score, _ in process.extract(
+            req, vocab, scorer=fuzz.ratio, score_cutoff=FUZZY_SKILL_CUTOFF, limit=None
+        ):
+            if score > FUZZY_SKILL_CUTOFF:
+                matched.add(skill)
+        return list(matched)
+
+    def shortlist(self, plan: ScoringPlan, limit: int) -> List[Tuple[int, Optional[int], Dict[str, Any]]]:
+        """
+        (resume_id, job_seeker_id, profile) of the resumes that share the most
+        weighted requirement terms with the job, best first. Resumes sharing no
+        term at all are never returned. Entries are taken under the same lock
+        as the lookup, so a concurrent update or removal can't invalidate them.
+        """
+        hits: Dict[int, float] = defaultdict(float)
+
+        with self._lock:
+            for text, weight in zip(plan.skill_texts, plan.skill_weights):
+                matched: Set[int] = set()
+                for skill in self._matching_skills(text):
+                    matched |= self._skills[skill]
+                for resume_id in matched:
+                    hits[resume_id] += weight
+
+            token_requirements = [
+                (self._degree_tokens, text.split(), weight)
+                for text, weight in zip(plan.education_texts, plan.education_weights)
+            ] + [
+                (self._experience_tokens, req_vocab, weight)
+                for (_, req_vocab), weight in zip(plan.experience_tokens, plan.experience_weights)
+            ]
+
+            for postings, tokens, weight in token_requirements:
+                tokens = set(tokens)
+                if not tokens:
+                    continue
+                share = weight / len(tokens)
+                for token in tokens:
+                    for resume_id in postings.get(token, ()):
+                        hits[resume_id] += share
+
+            best = sorted(hits, key=hits.get, reverse=True)[:limit]
+            return [(resume_id, self._owners.get(resume_id), self._profiles[resume_id]) for resume_id in best]
+
+
+skill_index = SkillIndex()
@@ -0,0 +1,138 @@
+import os
+from pathlib import Path
+from typing import Set
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env.local (same file as supabase_client)
+env_path = Path(__file__).parent.parent / '.env.local'
+load_dotenv(dotenv_path=env_path)
+
+
+# =============================================================================
+# Resume Processing Workers
+# =============================================================================
+
+# Number of worker processes running the PDF/image pipelines.
+# 0 disables the pool and runs pipelines in the default thread executor.
+RESUME_WORKERS: int = int(os.environ.get("RESUME_WORKERS", "2"))
+
+# Pipelines this deployment serves ("pdf", "image"). Modules and models of a
+# disabled pipeline are never imported, e.g. ENABLED_PIPELINES=pdf for
+# PDF-only workers that should not carry the image models.
+ENABLED_PIPELINES: Set[str] = {
+    name.strip().lower()
+    for name in os.environ.get("ENABLED_PIPELINES", "pdf,image").split(",")
+    if name.strip()
+}
+
+# Threads per pipeline process for per-page PDF work that releases the GIL
+# (OpenCV face detection on every page of a multi-page resume)
+PDF_PAGE_THREADS: int = int(os.environ.get("PDF_PAGE_THREADS", "4"))
+
+# Exported model files (e.g. the int8 ONNX section classifier), built on first use
+MODEL_ARTIFACT_DIR: str = os.environ.get("MODEL_ARTIFACT_DIR", os.path.join("tmp", "models"))
+
+
+# =============================================================================
+# Resume Processing Jobs
+# =============================================================================
+
+# SQLite file backing the submit/poll job queue
+JOBS_DB_PATH: str = os.environ.get("JOBS_DB_PATH", os.path.join("tmp", "resume_jobs.db"))
+
+# Finished jobs are purged after this many seconds
+JOBS_RETENTION_SECONDS: int = int(os.environ.get("JOBS_RETENTION_SECONDS", str(24 * 60 * 60)))
+
+
+# =============================================================================
+# Batch Processing
+# =============================================================================
+
+# Maximum number of files accepted by /api/py/process-batch
+BATCH_MAX_FILES: int = int(os.environ.get("BATCH_MAX_FILES", "50"))
+
+
+# =============================================================================
+# Result Cache
+# =============================================================================
+
+# Bump (or set via env on deploy) whenever pipeline output changes;
+# it is part of every cache key, so old entries stop matching.
+PIPELINE_VERSION: str = os.environ.get("PIPELINE_VERSION", "4")
+
+RESULT_CACHE_ENABLED: bool = os.environ.get("RESULT_CACHE_ENABLED", "true").lower() == "true"
+
+# In-memory LRU size (number of results)
+RESULT_CACHE_MEMORY_ENTRIES: int = int(os.environ.get("RESULT_CACHE_MEMORY_ENTRIES", "256"))
+
+# On-disk store, evicted least-recently-used first once it exceeds the size limit
+RESULT_CACHE_DIR: str = os.environ.get("RESULT_CACHE_DIR", os.path.join("tmp", "result_cache"))
+RESULT_CACHE_DISK_MAX_BYTES: int = int(os.environ.get("RESULT_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+# =============================================================================
+# Admission Control
+# =============================================================================
+
+# Concurrent requests allowed into each pipeline, and how many more may wait.
+# Anything beyond that is rejected with 503 + Retry-After instead of queueing
+# unbounded work (each in-flight PDF holds a temp file, a docling document
+# and model activations).
+PDF_MAX_CONCURRENCY: int = int(os.environ.get("PDF_MAX_CONCURRENCY", str(max(RESUME_WORKERS, 1))))
+PDF_MAX_QUEUE: int = int(os.environ.get("PDF_MAX_QUEUE", "8"))
+
+IMAGE_MAX_CONCURRENCY: int = int(os.environ.get("IMAGE_MAX_CONCURRENCY", str(max(RESUME_WORKERS, 1))))
+IMAGE_MAX_QUEUE: int = int(os.environ.get("IMAGE_MAX_QUEUE", "8"))
+
+BATCH_MAX_CONCURRENCY: int = int(os.environ.get("BATCH_MAX_CONCURRENCY", "1"))
+BATCH_MAX_QUEUE: int = int(os.environ.get("BATCH_MAX_QUEUE", "2"))
+
+RANK_MAX_CONCURRENCY: int = int(os.environ.get("RANK_MAX_CONCURRENCY", "16"))
+RANK_MAX_QUEUE: int = int(os.environ.get("RANK_MAX_QUEUE", "64"))
+
+# Retry-After header (seconds) sent with 503 rejections
+ADMISSION_RETRY_AFTER_SECONDS: int = int(os.environ.get("ADMISSION_RETRY_AFTER_SECONDS", "10"))
+
+
+# =============================================================================
+# Upload Ingestion
+# =============================================================================
+
+# Largest accepted resume file (matches MAX_RESUME_FILE_SIZE in the frontend)
+UPLOAD_MAX_BYTES: int = int(os.environ.get("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Uploads are streamed to one spooled file per request in this directory
+UPLOAD_SPOOL_DIR: str = os.environ.get("UPLOAD_SPOOL_DIR", os.path.join("tmp", "uploads"))
+
+UPLOAD_CHUNK_BYTES: int = int(os.environ.get("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+
+# =============================================================================
+# Talent Pool Ranking
+# =============================================================================
+
+# Largest k accepted by /api/py/rank/job/{job_id}/top
+RANK_TOP_K_MAX: int = int(os.environ.get("RANK_TOP_K_MAX", "100"))
+
+# The skill index shortlists max(k * factor, minimum) resumes for exact scoring
+RANK_SHORTLIST_FACTOR: int = int(os.environ.get("RANK_SHORTLIST_FACTOR", "5"))
+RANK_SHORTLIST_MIN: int = int(os.environ.get("RANK_SHORTLIST_MIN", "50"))
+
+# The in-process skill index is reloaded from the resume table after this long
+SKILL_INDEX_MAX_AGE_SECONDS: int = int(os.environ.get("SKILL_INDEX_MAX_AGE_SECONDS", str(60 * 60)))
+
+# Pool-level scoring (job ranking and top-K): "fuzzy" = character-ratio matchers
+# only; "tfidf" = blend a per-job TF-IDF cosine similarity into final_score
+RANK_SCORING_MODE: str = os.environ.get("RANK_SCORING_MODE", "fuzzy").lower()
+
+# Share of final_score taken by the TF-IDF similarity in "tfidf" mode (1.0 = TF-IDF only)
+RANK_TFIDF_WEIGHT: float = float(os.environ.get("RANK_TFIDF_WEIGHT", "0.3"))
+
+# Compiled requirement scoring plans cached per job (LRU); the recruiter edit
+# route invalidates a job's plan, the TTL bounds staleness across instances
+PLAN_CACHE_ENTRIES: int = int(os.environ.get("PLAN_CACHE_ENTRIES", "512"))
+PLAN_CACHE_TTL_SECONDS: int = int(os.environ.get("PLAN_CACHE_TTL_SECONDS", "300"))
+
+# Keep-alive connections of the shared async Supabase client used by the ranking service
+SUPABASE_POOL_CONNECTIONS: int = int(os.environ.get("SUPABASE_POOL_CONNECTIONS", "20"))
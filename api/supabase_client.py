@@ -1,9 +1,13 @@
+import asyncio
 import os
 import uuid
 from pathlib import Path
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from typing import Dict, Any
+import httpx
+from supabase import create_client, acreate_client, AsyncClient, AsyncClientOptions, Client
+from typing import Dict, Any, Optional
+
+from api.settings import SUPABASE_POOL_CONNECTIONS
 
 # Load environment variables from .env.local
 env_path = Path(__file__).parent.parent / '.env.local'
@@ -22,6 +26,38 @@ if not key:
 # Create Supabase client
 supabase: Client = create_client(url, key)
 
+# Async client for the ranking service, created on first use (acreate_client
+# must be awaited). Every query shares one pooled httpx connection pool.
+_async_supabase: Optional[AsyncClient] = None
+_async_supabase_lock = asyncio.Lock()
+
+
+async def get_async_supabase() -> AsyncClient:
+    global _async_supabase
+    if _async_supabase is None:
+        async with _async_supabase_lock:
+            if _async_supabase is None:
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=SUPABASE_POOL_CONNECTIONS,
+                        max_keepalive_connections=SUPABASE_POOL_CONNECTIONS,
+                    ),
+                    timeout=AsyncClientOptions().postgrest_client_timeout,
+                    follow_redirects=True,
+                )
+                _async_supabase = await acreate_client(
+                    url, key, options=AsyncClientOptions(httpx_client=http_client)
+                )
+    return _async_supabase
+
+
+async def close_async_supabase():
+    """Close the async client's connection pool (API shutdown)."""
+    global _async_supabase
+    if _async_supabase is not None:
+        await _async_supabase.options.httpx_client.aclose()
+        _async_supabase = None
+
 
 def upload_redacted_resume_to_storage(
     file_bytes: bytes,
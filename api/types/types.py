@@ -11,6 +11,7 @@ class TextSpan(BaseModel):
     label: str
     heading: Optional[str] = None
     bbox: Optional[Tuple[float, float, float, float]] = None
+    page: int = 0  # 0-based page index that bbox refers to
 
 class TextGroup(BaseModel):
     heading: str
@@ -66,4 +67,8 @@ class ApiResponse(BaseModel):
     status: str
     data: Optional[ResumeData] = None
     message: Optional[str] = None
-    redacted_file_url: Optional[str] = None
\ No newline at end of file
+    redacted_file_url: Optional[str] = None
+
+class BatchItemResponse(BaseModel):
+    filename: Optional[str] = None
+    result: ApiResponse
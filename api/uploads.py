@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from api.settings import BATCH_MAX_FILES, UPLOAD_CHUNK_BYTES, UPLOAD_MAX_BYTES, UPLOAD_SPOOL_DIR
+
+logger = logging.getLogger("api.uploads")
+
+
+# =============================================================================
+# Magic-byte Sniffing
+# =============================================================================
+
+# (magic prefix, resume kind, file extension)
+_SIGNATURES = [
+    (b"%PDF-", "pdf", "pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image", "png"),
+    (b"\xff\xd8\xff", "image", "jpg"),
+]
+
+SNIFF_BYTES = 8
+
+
+def sniff_file_type(head: bytes) -> Optional[tuple]:
+    """Return (kind, extension) for a supported resume file, based on its first bytes."""
+    for magic, kind, extension in _SIGNATURES:
+        if head.startswith(magic):
+            return kind, extension
+    return None
+
+
+# =============================================================================
+# Spooled Upload
+# =============================================================================
+
+@dataclass
+class SpooledUpload:
+    """
+    One on-disk copy of an uploaded file. Every pipeline stage reads this
+    path directly, so the upload is never held in memory as a whole.
+    """
+    path: str
+    filename: Optional[str]
+    kind: str
+    extension: str
+    size: int
+    sha256: str
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {UPLOAD_MAX_BYTES // (1024 * 1024)}MB upload limit",
+    )
+
+
+async def spool_upload(file: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> SpooledUpload:
+    """
+    Stream an upload in chunks into a single spooled file.
+
+    Rejects oversized files (413) as soon as the limit is crossed and files
+    whose magic bytes are not PDF/PNG/JPEG (415), while hashing the content
+    for the result cache on the way through.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large()
+
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="upload_", dir=UPLOAD_SPOOL_DIR)
+
+    digest = hashlib.sha256()
+    size = 0
+    detected = None
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+
+                if detected is None:
+                    detected = sniff_file_type(chunk[:SNIFF_BYTES])
+                    if detected is None:
+                        raise HTTPException(
+                            status_code=415,
+                            detail="Unsupported file type. Please upload a PDF, JPG, or PNG file.",
+                        )
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large()
+
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+
+        if detected is None:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+        kind, extension = detected
+
+        # Give the spool the real extension (OpenCV picks its codec from it)
+        final_path = f"{path}.{extension}"
+        os.replace(path, final_path)
+
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+
+    logger.info(f"[Upload] Spooled {file.filename} ({kind}, {size} bytes)")
+
+    return SpooledUpload(
+        path=final_path,
+        filename=file.filename,
+        kind=kind,
+        extension=extension,
+        size=size,
+        sha256=digest.hexdigest(),
+    )
+
+
+# =============================================================================
+# Request Size Limit (ASGI middleware)
+# =============================================================================
+
+# Multipart framing on top of the file itself
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized upload requests before the multipart body is parsed.
+
+    FastAPI parses the whole form before the endpoint runs, so the per-file
+    limit in ``spool_upload`` alone would only trigger after the body has
+    been received. This checks Content-Length up front and counts streamed
+    bytes for chunked requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _limit_for(path: str) -> int:
+        if path.endswith("/process-batch"):
+            return BATCH_MAX_FILES * (UPLOAD_MAX_BYTES + _MULTIPART_OVERHEAD)
+        return UPLOAD_MAX_BYTES + _MULTIPART_OVERHEAD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if not content_type.startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit_for(scope["path"])
+
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                await self._reject(send, 400, "Invalid Content-Length header")
+                return
+            if declared > limit:
+                await self._reject(send, 413, "Request body exceeds the upload limit")
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, status_code: int, detail: str):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Union
+
+from api.settings import ENABLED_PIPELINES, RESUME_WORKERS
+
+logger = logging.getLogger("api.workers")
+
+
+# =============================================================================
+# Process Pool
+# =============================================================================
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_STATUS_QUEUE = None
+_STATUS_THREAD: Optional[threading.Thread] = None
+
+
+def _init_worker(status_queue):
+    """Runs once in every worker process: set up logging, then load and warm all models."""
+    from api.logging_config import setup_logging
+    setup_logging(debug=False)
+
+    from api import metrics, progress
+    from api.preload import warm_models
+
+    # Stage timings, model counts and progress streams are served by the API process
+    metrics.forward_to(status_queue.put)
+    progress.forward_to(status_queue.put)
+
+    worker_logger = logging.getLogger("api.workers")
+    worker_logger.info("[Worker] Loading models...")
+
+    report = warm_models()
+    status_queue.put(("ready", f"worker-{os.getpid()}", report))
+
+    worker_logger.info("[Worker] Models loaded, ready for resumes.")
+
+
+def _collect_worker_reports(status_queue):
+    """Parent-side thread: apply warm-up reports, metric and progress events sent by workers."""
+    from api import metrics, progress
+    from api.preload import readiness
+
+    while True:
+        item = status_queue.get()
+        if item is None:
+            break
+
+        if item[0] == "ready":
+            _, process_id, report = item
+            readiness.record(process_id, report)
+        elif item[0] == "metric":
+            metrics.apply_event(item)
+        elif item[0] == "progress":
+            progress.dispatch(item)
+
+
+def _ping() -> bool:
+    return True
+
+
+# =============================================================================
+# Pipeline Dispatch
+# =============================================================================
+
+def pipeline_enabled(kind: str) -> bool:
+    return kind in ENABLED_PIPELINES
+
+
+def process_resume(
+    kind: str,
+    source: Union[bytes, str],
+    stream_id: Optional[str] = None,
+    layout: Optional[str] = None,
+):
+    """
+    Picklable entry point that runs the pipeline for ``kind`` inside a worker.
+    ``source`` is either the file bytes or the path of a spooled upload.
+    With a ``stream_id``, stage and partial-result events go to that progress stream.
+    ``layout`` picks the PDF layout backend (ignored for images).
+    Pipeline modules are imported here, on first use, never at API import time.
+    """
+    if not pipeline_enabled(kind):
+        raise ValueError(f"The {kind} pipeline is not enabled (ENABLED_PIPELINES)")
+
+    if kind == "pdf":
+        from api.pdf.pipeline import process_pdf_resume, process_pdf_file
+        pdf_pipeline = process_pdf_file if isinstance(source, str) else process_pdf_resume
+        pipeline = lambda source: pdf_pipeline(source, layout)
+    elif kind == "image":
+        from api.image.pipeline import process_image_resume, process_image_file
+        pipeline = process_image_file if isinstance(source, str) else process_image_resume
+    else:
+        raise ValueError(f"Unknown resume kind: {kind}")
+
+    from api import metrics, progress
+
+    start = time.perf_counter()
+    try:
+        with progress.streaming(stream_id):
+            result = pipeline(source)
+    finally:
+        # Progress travels over the status queue, not with the result: mark its end there
+        progress.end(stream_id)
+    metrics.observe_pipeline(kind, result.status, time.perf_counter() - start)
+    return result
+
+
+def process_pdf_files(pdf_paths: List[str], layout: Optional[str] = None):
+    """Picklable entry point for the batched PDF pipeline (paths of spooled uploads)."""
+    if not pipeline_enabled("pdf"):
+        raise ValueError("The pdf pipeline is not enabled (ENABLED_PIPELINES)")
+
+    from api import metrics
+    from api.pdf.pipeline import process_pdf_batch
+
+    start = time.perf_counter()
+    results = process_pdf_batch(pdf_paths, layout)
+    metrics.observe_pipeline("pdf_batch", "success", time.perf_counter() - start)
+    return results
+
+
+def start_workers() -> Optional[ProcessPoolExecutor]:
+    global _EXECUTOR, _STATUS_QUEUE, _STATUS_THREAD
+
+    if _EXECUTOR is not None or RESUME_WORKERS <= 0:
+        return _EXECUTOR
+
+    from api.preload import readiness
+
+    logger.info(f"[Workers] Starting process pool with {RESUME_WORKERS} workers")
+    readiness.expect(RESUME_WORKERS)
+
+    # "spawn" keeps torch / CUDA state out of the children
+    ctx = multiprocessing.get_context("spawn")
+    _STATUS_QUEUE = ctx.Queue()
+    _STATUS_THREAD = threading.Thread(
+        target=_collect_worker_reports,
+        args=(_STATUS_QUEUE,),
+        name="worker-readiness",
+        daemon=True,
+    )
+    _STATUS_THREAD.start()
+
+    _EXECUTOR = ProcessPoolExecutor(
+        max_workers=RESUME_WORKERS,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(_STATUS_QUEUE,),
+    )
+
+    # Spawn every worker now so model loading happens before the first upload
+    for _ in range(RESUME_WORKERS):
+        _EXECUTOR.submit(_ping)
+
+    return _EXECUTOR
+
+
+def shutdown_workers():
+    global _EXECUTOR, _STATUS_QUEUE, _STATUS_THREAD
+
+    if _EXECUTOR is None:
+        return
+
+    logger.info("[Workers] Shutting down process pool")
+    _EXECUTOR.shutdown(wait=True, cancel_futures=True)
+    _EXECUTOR = None
+
+    _STATUS_QUEUE.put(None)
+    _STATUS_THREAD.join(timeout=5)
+    _STATUS_QUEUE = None
+    _STATUS_THREAD = None
+
+
+def workers_enabled() -> bool:
+    return _EXECUTOR is not None
+
+
+async def run_in_worker(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a pipeline function off the event loop.
+
+    Uses the process pool when it is running, otherwise falls back to the
+    default thread executor so the endpoints still never block the loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, fn, *args)
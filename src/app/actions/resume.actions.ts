@@ -10,6 +10,7 @@ import {
     deleteResumeFile,
     unsetAllProfileResumes,
 } from '@/services/resume.service';
+import { fetchFromFastAPI } from '@/utils/api';
 
 /**
  * Filter out empty or whitespace-only skills
@@ -56,6 +57,19 @@ function filterEmptyEducation(education: EducationOut[]): EducationOut[] {
     return education.filter(edu => !isEducationEmpty(edu));
 }
 
+/**
+ * Add, refresh or drop a resume in the ranking service's talent-pool index
+ * (used by "top candidates" for a job). Never fails the calling action; the
+ * index also reloads itself periodically.
+ */
+async function refreshTalentPoolIndex(resumeId: number) {
+    try {
+        await fetchFromFastAPI(`/api/py/rank/index/resume/${resumeId}`, { method: 'POST' });
+    } catch (error) {
+        console.error('Error updating talent pool index:', error);
+    }
+}
+
 /**
  * Delete resume by updating its status to 'deleted'
  * 
@@ -66,6 +80,7 @@ export async function deleteResume(resumeId: number) {
     try {
         const jobSeekerId = await getAuthenticatedJobSeeker();
         await markResumeAsDeleted(resumeId, jobSeekerId);
+        await refreshTalentPoolIndex(resumeId);
 
         return {
             success: true,
@@ -135,6 +150,8 @@ export async function saveResumeToDatabase(
             throw new Error('Failed to create resume record');
         }
 
+        await refreshTalentPoolIndex(resumeRecord.resume_id);
+
         return {
             success: true,
             resume: resumeRecord,
@@ -185,6 +202,7 @@ export async function updateResumeSkills(resumeId: number, skills: string[]) {
             .eq('resume_id', resumeId);
 
         if (error) throw error;
+        await refreshTalentPoolIndex(resumeId);
 
         return {
             success: true,
@@ -228,6 +246,7 @@ export async function updateResumeExperience(resumeId: number, experiences: Expe
             .eq('resume_id', resumeId);
 
         if (error) throw error;
+        await refreshTalentPoolIndex(resumeId);
 
         return {
             success: true,
@@ -271,6 +290,7 @@ export async function updateResumeEducation(resumeId: number, education: Educati
             .eq('resume_id', resumeId);
 
         if (error) throw error;
+        await refreshTalentPoolIndex(resumeId);
 
         return {
             success: true,
@@ -1,5 +1,6 @@
 "use server";
 
+import { after } from "next/server";
 import { updateJob } from "@/services/job.service";
 import { getCurrentRecruiter } from "@/services";
 import {
@@ -73,5 +74,25 @@ export async function updateJobAction(
     return { success: false, error: "Failed to update job requirements." };
   }
 
+  // Drop the ranking service's compiled requirements for this job, then
+  // re-rank its applicants (only added or edited requirements are rescored).
+  // A job can have thousands of applicants, so this runs after the response.
+  after(() => rerankJob(jobId));
+
   return { success: true };
 }
+
+async function rerankJob(jobId: number) {
+  const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000';
+  try {
+    for (const path of [`/api/py/rank/job/${jobId}/invalidate`, `/api/py/rank/job/${jobId}`]) {
+      const response = await fetch(`${apiUrl}${path}`, { method: 'POST' });
+      if (!response.ok) {
+        throw new Error(`${path} returned ${response.status}: ${await response.text()}`);
+      }
+    }
+  } catch (rankingError) {
+    // Cached plans also expire on their own; never fail the edit over this
+    console.error(`Error re-ranking applications of job ${jobId}:`, rankingError);
+  }
+}
@@ -218,6 +218,45 @@ $$;
 
 ALTER FUNCTION "public"."is_user_onboarded"("user_id" "uuid") OWNER TO "postgres";
 
+
+CREATE OR REPLACE FUNCTION "public"."update_application_scores"("scores" "jsonb") RETURNS integer
+    LANGUAGE "sql"
+    AS $$
+  -- Bulk write of ranking results: [{application_id, match_score, requirement_scores}, ...].
+  -- Update only, so an application deleted since it was read is skipped, never re-created.
+  WITH updated AS (
+    UPDATE public.application AS a
+    SET match_score = s.match_score,
+        requirement_scores = s.requirement_scores
+    FROM jsonb_to_recordset(scores) AS s(application_id integer, match_score real, requirement_scores jsonb)
+    WHERE a.application_id = s.application_id
+    RETURNING a.application_id
+  )
+  SELECT COUNT(*)::integer FROM updated;
+$$;
+
+
+ALTER FUNCTION "public"."update_application_scores"("scores" "jsonb") OWNER TO "postgres";
+
+
+CREATE OR REPLACE FUNCTION "public"."update_ranking_profiles"("profiles" "jsonb") RETURNS integer
+    LANGUAGE "sql"
+    AS $$
+  -- Bulk write of rebuilt ranking profiles: [{resume_id, ranking_profile}, ...].
+  -- Update only, so a resume deleted since it was read is skipped, never re-created.
+  WITH updated AS (
+    UPDATE public.resume AS r
+    SET ranking_profile = p.ranking_profile
+    FROM jsonb_to_recordset(profiles) AS p(resume_id integer, ranking_profile jsonb)
+    WHERE r.resume_id = p.resume_id
+    RETURNING r.resume_id
+  )
+  SELECT COUNT(*)::integer FROM updated;
+$$;
+
+
+ALTER FUNCTION "public"."update_ranking_profiles"("profiles" "jsonb") OWNER TO "postgres";
+
 SET default_tablespace = '';
 
 SET default_table_access_method = "heap";
@@ -232,7 +271,8 @@ CREATE TABLE IF NOT EXISTS "public"."application" (
     "is_bookmark" boolean DEFAULT false,
     "status" "public"."application_status_enum" DEFAULT 'unknown'::"public"."application_status_enum" NOT NULL,
     "created_at" timestamp with time zone DEFAULT "now"() NOT NULL,
-    "updated_at" timestamp with time zone
+    "updated_at" timestamp with time zone,
+    "requirement_scores" "jsonb"
 );
 
 
@@ -455,7 +495,8 @@ CREATE TABLE IF NOT EXISTS "public"."resume" (
     "feedback" "text",
     "created_at" timestamp with time zone DEFAULT "now"() NOT NULL,
     "updated_at" timestamp with time zone,
-    "filename" "text"
+    "filename" "text",
+    "ranking_profile" "jsonb"
 );
 
 
@@ -1087,6 +1128,14 @@ GRANT ALL ON FUNCTION "public"."is_user_onboarded"("user_id" "uuid") TO "service
 
 
 
+-- Ranking service only
+REVOKE ALL ON FUNCTION "public"."update_application_scores"("scores" "jsonb") FROM PUBLIC;
+GRANT ALL ON FUNCTION "public"."update_application_scores"("scores" "jsonb") TO "service_role";
+REVOKE ALL ON FUNCTION "public"."update_ranking_profiles"("profiles" "jsonb") FROM PUBLIC;
+GRANT ALL ON FUNCTION "public"."update_ranking_profiles"("profiles" "jsonb") TO "service_role";
+
+
+
 
 
 